@@ -0,0 +1,59 @@
+import json
+
+from minibench import Benchmark
+
+from faker import Faker
+
+from flask import Flask, request
+
+from flask_restplus.payload import get_payload
+from flask_restplus.representations import load_backend
+
+fake = Faker()
+app = Flask(__name__)
+
+#: The fastest installed decoder (fallback on json)
+decoder_app = Flask(__name__)
+decoder_app.config['RESTPLUS_JSON_DECODER'] = load_backend('auto').loads
+
+
+def person():
+    return {
+        'name': fake.name(),
+        'age': fake.pyint(),
+        'address': fake.address(),
+    }
+
+
+BODY = json.dumps([person() for _ in range(1000)])
+
+
+def request_context(app):
+    return app.test_request_context('/', method='POST', data=BODY,
+                                    headers={'content-type': 'application/json'})
+
+
+class PayloadBenchmark(Benchmark):
+    '''
+    Request payload decoding by validation, ``Api.payload`` and the request parser.
+
+    Flask already caches ``request.get_json()`` so sharing the payload is on par:
+    only a faster ``RESTPLUS_JSON_DECODER`` makes a difference.
+    '''
+    times = 100
+
+    def bench_flask_get_json(self):
+        with request_context(app):
+            request.get_json()  # Validation
+            request.get_json()  # Request parser
+            request.json  # Api.payload
+
+    def bench_shared_payload(self):
+        with request_context(app):
+            for _ in range(3):
+                get_payload()
+
+    def bench_shared_payload_with_decoder(self):
+        with request_context(decoder_app):
+            for _ in range(3):
+                get_payload()
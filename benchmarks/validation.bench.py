@@ -0,0 +1,58 @@
+from minibench import Benchmark
+
+from faker import Faker
+
+from jsonschema import Draft4Validator, RefResolver
+
+from flask_restplus import fields, Api
+from flask_restplus.validation import CompiledValidator
+
+fake = Faker()
+api = Api()
+
+person = api.model('Person', {
+    'name': fields.String(required=True, min_length=1),
+    'age': fields.Integer(min=0)
+})
+
+family = api.model('Family', {
+    'name': fields.String(required=True),
+    'father': fields.Nested(person),
+    'mother': fields.Nested(person),
+    'children': fields.List(fields.Nested(person))
+})
+
+resolver = RefResolver.from_schema({
+    'definitions': dict((name, model.__schema__) for name, model in api.models.items())
+})
+
+
+def person_data():
+    return {
+        'name': fake.name(),
+        'age': fake.pyint()
+    }
+
+
+def family_data():
+    return {
+        'name': fake.last_name(),
+        'father': person_data(),
+        'mother': person_data(),
+        'children': [person_data() for _ in range(10)]
+    }
+
+
+class ValidationBenchmark(Benchmark):
+    '''Payload validation benchmark: generic jsonschema vs compiled validators'''
+    times = 1000
+
+    def before_class(self):
+        self.generic = Draft4Validator(family.__schema__, resolver=resolver)
+        self.compiled = CompiledValidator(family.__schema__, resolver=resolver)
+
+    def bench_generic_validator(self):
+        return list(self.generic.iter_errors(family_data()))
+
+    def bench_compiled_validator(self):
+        return list(self.compiled.iter_errors(family_data()))
@@ -2,6 +2,8 @@
 # flake8: noqa
 from __future__ import unicode_literals
 
+import sys
+
 try:
     from collections import OrderedDict
 except ImportError:
@@ -11,3 +13,12 @@ try:
     from urlparse import urlparse, urlunparse
 except ImportError:
     from urllib.parse import urlparse, urlunparse
+
+if sys.version_info >= (3, 5):
+    from . import aio
+    from .aio import is_awaitable
+else:
+    aio = None
+
+    def is_awaitable(obj):
+        return False
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+'''
+Asynchronous handlers support (Python 3.5+ only).
+
+This module is only imported on Python versions supporting ``async def``.
+'''
+from __future__ import unicode_literals
+
+import asyncio
+import inspect
+
+from concurrent.futures import Future
+
+
+__all__ = ('is_awaitable', 'then', 'run', 'is_running', 'resolve', 'drain')
+
+
+def is_awaitable(obj):
+    '''Whether or not an object is awaitable (ie. the result of an ``async def`` handler)'''
+    return inspect.isawaitable(obj)
+
+
+async def then(awaitable, callback):
+    '''Await an awaitable then apply ``callback`` on its result (awaited too if needed)'''
+    result = callback(await awaitable)
+    if is_awaitable(result):
+        result = await result
+    return result
+
+
+def run(awaitable, local):
+    '''
+    Run an awaitable until completion on the event loop of the current thread.
+
+    Loops are stored on a :class:`threading.local` so request contexts,
+    bound to threads, stay available in handlers.
+
+    :param awaitable: The awaitable to run
+    :param threading.local local: The thread local storage holding the loops
+    :return: the awaitable result
+    '''
+    loop = getattr(local, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = local.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(awaitable)
+
+
+async def settle(awaitable):
+    try:
+        return None, await awaitable
+    except Exception as e:
+        return e, None
+
+
+def is_running():
+    '''Whether or not an event loop is already running in the current thread'''
+    get_running_loop = getattr(asyncio, '_get_running_loop', None)  # Python 3.5.3+
+    if get_running_loop is not None:
+        return get_running_loop() is not None
+    return asyncio.get_event_loop().is_running()
+
+
+def resolve(awaitables, local, get_executor):
+    '''
+    Resolve awaitables concurrently.
+
+    They are run on the event loop of the current thread (see :func:`run`)
+    so the Flask contexts stay available.
+    Only if this thread is already running an event loop (which can't be blocked on),
+    they are run on a dedicated event loop in a thread of an executor.
+
+    :param list awaitables: The awaitables to resolve
+    :param threading.local local: The thread local storage holding the loops
+    :param callable get_executor: Return the :class:`concurrent.futures.Executor` used from a running event loop
+    :return: an ``(error, result)`` tuple for each awaitable
+    '''
+    async def gather():
+        return await asyncio.gather(*[settle(awaitable) for awaitable in awaitables])
+
+    if not is_running():
+        return run(gather(), local)
+
+    def target():
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(gather())
+        finally:
+            loop.close()
+
+    return get_executor().submit(target).result()
+
+
+async def drain(collector):
+    '''
+    Resolve the values of a :class:`~flask_restplus.deferred.Collector` on the running event loop.
+
+    Unlike :func:`resolve`, awaitables bound to this loop (ie. tasks created by the handler)
+    are supported and the loop is not blocked.
+    '''
+    while collector.pending or collector.batches:
+        pending = collector.load_batches()
+        results = await asyncio.gather(*[
+            settle(asyncio.wrap_future(d.value) if isinstance(d.value, Future) else d.value) for d in pending
+        ])
+        collector.settle(pending, results)
+
@@ -3,33 +3,39 @@ from __future__ import unicode_literals
 
 import copy
 import difflib
+import gc
 import inspect
 import re
 import six
 import sys
+import threading
 
-from flask import url_for, request, current_app
+from flask import url_for, request, current_app, make_response as original_flask_make_response
 from flask.signals import got_request_exception
 
 import flask_restful as restful
 
-from jsonschema import RefResolver
-
 from werkzeug import cached_property
 from werkzeug.datastructures import Headers
-from werkzeug.exceptions import HTTPException
+from werkzeug.exceptions import HTTPException, InternalServerError, NotAcceptable
 from werkzeug.http import HTTP_STATUS_CODES
 
-from . import apidoc
-from .errors import abort
+from . import apidoc, artefacts
+from ._compat import aio
+from .caching import etag, cached, coalesce, invalidate, MemoryCache, CACHE_CONTROL
+from .errors import abort, SpecsError
+from .idempotency import idempotent
 from .marshalling import marshal, marshal_with
 from .model import Model
 from .mask import ParseError, MaskError
 from .namespace import Namespace
+from .payload import get_payload
 from .postman import PostmanCollectionV1
+from .representations import output_json
 from .resource import Resource
 from .swagger import Swagger
-from .utils import merge, default_id, camel_to_dash, unpack
+from .utils import merge, default_id, camel_to_dash, unpack, best_match
+from .validation import Definitions
 from .reqparse import RequestParser
 
 RE_RULES = re.compile('(<.*>)')
@@ -109,15 +115,24 @@ class Api(restful.Api):
             MaskError: mask_error_handler,
         }
         self._schema = None
+        self._specs = None
         self.models = {}
         self._refresolver = None
+        self._frozen = False
+        self._loops = threading.local()
+        self._response_cache = None
+        self._idempotency_store = None
         self.namespaces = []
         self.default_namespace = Namespace(self, default, default_label,
             endpoint='{0}-declaration'.format(default),
             path='/'
         )
         self.add_namespace(self.default_namespace)
+        # Resources and models are registered after the constructor
+        self._constructing = True
         super(Api, self).__init__(app, **kwargs)
+        self._constructing = False
+        self.representations['application/json'] = output_json
 
     def init_app(self, app, **kwargs):
         '''
@@ -156,6 +171,17 @@ class Api(restful.Api):
         self._validate = self._validate if self._validate is not None else app.config.get('RESTPLUS_VALIDATE', False)
         app.config.setdefault('RESTPLUS_MASK_HEADER', 'X-Fields')
         app.config.setdefault('RESTPLUS_MASK_SWAGGER', True)
+        app.config.setdefault('RESTPLUS_VIEW_HEADER', 'X-View')
+        app.config.setdefault('RESTPLUS_VIEW_ARG', None)
+        if app.config.get('RESTPLUS_EAGER', False) and not self._frozen:
+            if self.blueprint:
+                # Blueprint rules are only registered after this deferred initialization
+                self.blueprint.record(lambda state: self._frozen or self.freeze(state.app))
+            elif self._constructing:
+                # Nothing is registered yet with ``Api(app)``: wait for the application to be used
+                app.before_first_request(lambda: self._frozen or self.freeze(app))
+            else:
+                self.freeze(app)
 
     def _register_apidoc(self, app):
         conf = app.extensions.setdefault('restplus', {})
@@ -228,6 +254,7 @@ class Api(restful.Api):
         :param Resource resource: the resource ro register
         :param Namespace namespace: the namespace holdingg the resource
         '''
+        self._ensure_not_frozen()
         namespace = kwargs.pop('namespace', None)
         if kwargs.pop('doc', True) and not namespace:
             return self.default_namespace.add_resource(resource, *urls, **kwargs)
@@ -242,10 +269,15 @@ class Api(restful.Api):
         args.insert(0, self)
         kwargs['resource_class_args'] = args
 
+        if kwargs.pop('singleton', False):
+            resource.singleton = True
+        if hasattr(resource, 'dispatch_table'):
+            resource.dispatch_table()
         super(Api, self).add_resource(resource, *urls, **kwargs)
         return endpoint
 
     def add_namespace(self, ns):
+        self._ensure_not_frozen()
         if ns not in self.namespaces:
             self.namespaces.append(ns)
 
@@ -324,7 +356,11 @@ class Api(restful.Api):
         :returns dict: the schema as a serializable dict
         '''
         if not self._schema:
-            self._schema = Swagger(self).as_dict()
+            if self._specs is None:
+                self._schema = Swagger(self).as_dict()
+            else:
+                # Precomputed by freeze() without the request dependent base path
+                self._schema = dict(self._specs, basePath=Swagger(self).base_path())
         return self._schema
 
     def doc(self, shortcut=None, **kwargs):
@@ -350,14 +386,21 @@ class Api(restful.Api):
         '''
         abort(*args, **kwargs)
 
-    def model(self, name=None, model=None, mask=None, **kwargs):
+    def model(self, name=None, model=None, mask=None, views=None, cache=None, cache_key=None, **kwargs):
         '''
         Register a model
 
         Model can be either a dictionary or a fields. Raw subclass.
+
+        :param dict views: optional named masks, precompiled on registration
+        :param int|bool cache: optionally cache marshalled outputs by object version
+        :param str|callable cache_key: the object version key attribute (or function)
         '''
-        model = Model(name, model, mask=mask)
+        self._ensure_not_frozen()
+        model = Model(name, model, mask=mask, views=views, cache=cache, cache_key=cache_key)
         model.__apidoc__.update(kwargs)
+        if views:
+            model.compiled_views
         self.models[name] = model
         return model
 
@@ -365,6 +408,7 @@ class Api(restful.Api):
         '''
         Extend a model (Duplicate all fields)
         '''
+        self._ensure_not_frozen()
         if isinstance(parent, list):
             model = Model(None, {})
             for p in parent:
@@ -379,6 +423,7 @@ class Api(restful.Api):
         '''
         Inherit a modal (use the Swagger composition pattern aka. allOf)
         '''
+        self._ensure_not_frozen()
         model = parent.inherit(name, fields)
         self.models[name] = model
         return model
@@ -424,6 +469,7 @@ class Api(restful.Api):
                     code: (description, [fields]) if as_list else (description, fields)
                 },
                 '__mask__': kwargs.get('mask', True),  # Mask values can't be determined outside app context
+                '__views__': list(getattr(fields, '__views__', None) or []) or None,
             }
             func.__apidoc__ = merge(getattr(func, '__apidoc__', {}), doc)
             return marshal_with(fields, **kwargs)(func)
@@ -450,6 +496,32 @@ class Api(restful.Api):
             self._default_error_handler = exception
             return exception
 
+    def make_response(self, data, *args, **kwargs):
+        '''
+        Looks up the representation transformer for the requested mediatype
+        and invoke it to create a response object.
+
+        The negotiated mediatype is cached by ``Accept`` header.
+        If no representation matches and there is no default mediatype,
+        a 406 Not Acceptable response is sent.
+
+        :param data: Python object containing response data to be transformed
+        '''
+        default_mediatype = kwargs.pop('fallback_mediatype', None) or self.default_mediatype
+        mediatype = best_match(request.headers.get('Accept'), self.representations, default=default_mediatype)
+        if mediatype is None:
+            raise NotAcceptable()
+        if mediatype in self.representations:
+            resp = self.representations[mediatype](data, *args, **kwargs)
+            resp.headers['Content-Type'] = mediatype
+            return resp
+        elif mediatype == 'text/plain':
+            resp = original_flask_make_response(str(data), *args, **kwargs)
+            resp.headers['Content-Type'] = 'text/plain'
+            return resp
+        else:
+            raise InternalServerError()
+
     def handle_error(self, e):
         '''
         Error handler for the API transforms a raised exception into a Flask response,
@@ -507,6 +579,10 @@ class Api(restful.Api):
 
         resp = self.make_response(data, code, headers, fallback_mediatype=fallback_mediatype)
 
+        cache_control = getattr(request, CACHE_CONTROL, None)
+        if cache_control is not None and cache_control.errors:
+            cache_control.apply(resp)
+
         if code == 401:
             resp = self.unauthorized(resp)
         return resp
@@ -555,6 +631,152 @@ class Api(restful.Api):
         '''A decorator to mark a resource or a method as deprecated'''
         return self.doc(deprecated=True)(func)
 
+    def etag(self, version=None, weak=False):
+        '''
+        A decorator handling conditional ``GET`` and ``HEAD`` requests with entity tags.
+
+        Use it above :meth:`marshal_with` so the tag matches the marshalled body.
+
+        :param callable version: An optional function computing a cheap resource version
+            from the view arguments. A matching ``If-None-Match`` skips the handler.
+            Otherwise, the tag is a hash of the serialized response body.
+        :param bool weak: Whether or not tags are weak
+
+        See :class:`~flask_restplus.caching.etag`
+        '''
+        def wrapper(func):
+            func.__apidoc__ = merge(getattr(func, '__apidoc__', {}), {'__etag__': True})
+            return etag(version, weak, api=self)(func)
+        return wrapper
+
+    def cache(self, ttl=None, vary=None, backend=None):
+        '''
+        A decorator caching the serialized responses of ``GET`` and ``HEAD`` requests.
+
+        Entries are keyed by URL, fields mask, model view, negotiated mediatype
+        and the values of the ``vary`` request headers.
+        ``Authorization`` and ``Cookie`` are always included.
+
+        :param int ttl: The entries time to live in seconds
+            (default to the ``RESTPLUS_RESPONSE_CACHE_TTL`` configuration)
+        :param list vary: The request headers to include in the key
+        :param CacheBackend backend: The cache backend (default to :attr:`response_cache`)
+
+        See :meth:`invalidate` to explicitly expire entries.
+        '''
+        def wrapper(func):
+            doc = {'__cache__': {'ttl': ttl, 'vary': list(vary or []) or None}}
+            func.__apidoc__ = merge(getattr(func, '__apidoc__', {}), doc)
+            return cached(self, ttl, vary, backend)(func)
+        return wrapper
+
+    def cache_control(self, max_age=None, public=False, private=False, vary=None, errors=False, **kwargs):
+        '''
+        A decorator declaring the HTTP caching headers of an operation.
+
+        ``Cache-Control``, ``Expires`` and ``Vary`` headers are set on responses
+        (unless already set by the handler) and documented in the specifications.
+        This is a shortcut for ``@api.doc(cache={...})``,
+        which is also supported at the resource level.
+
+        :param int max_age: The ``max-age`` directive (also used to compute ``Expires``)
+        :param bool public: The ``public`` directive
+        :param bool private: The ``private`` directive
+        :param list vary: The request headers the response varies on
+        :param bool errors: Whether or not to set the headers on error responses too
+
+        See :class:`~flask_restplus.caching.CacheControl` for the other directives.
+        '''
+        kwargs.update(max_age=max_age, public=public, private=private, vary=vary, errors=errors)
+        return self.doc(cache=kwargs)
+
+    def coalesce(self, timeout=None, vary=None):
+        '''
+        A decorator coalescing concurrent identical ``GET`` and ``HEAD`` requests.
+
+        Only the first one runs the handler, the others share its serialized response
+        or raise its error.
+
+        :param float timeout: How long (in seconds) to wait for the in-flight request
+            before running the handler anyway
+            (default to the ``RESTPLUS_COALESCE_TIMEOUT`` configuration)
+        :param list vary: The request headers distinguishing requests (ie. ``Accept-Language``).
+            ``Authorization`` and ``Cookie`` are always included.
+        '''
+        def wrapper(func):
+            return coalesce(self, timeout, vary)(func)
+        return wrapper
+
+    @property
+    def response_cache(self):
+        '''
+        The default responses cache backend.
+
+        Default to the ``RESTPLUS_RESPONSE_CACHE`` configuration
+        or to an in-process :class:`~flask_restplus.caching.MemoryCache`
+        of ``RESTPLUS_RESPONSE_CACHE_SIZE`` entries.
+        '''
+        backend = current_app.config.get('RESTPLUS_RESPONSE_CACHE')
+        if backend is None:
+            if self._response_cache is None:
+                self._response_cache = MemoryCache(current_app.config.get('RESTPLUS_RESPONSE_CACHE_SIZE', 1024))
+            backend = self._response_cache
+        return backend
+
+    def idempotent(self, func=None, ttl=None, vary=None, store=None, timeout=None):
+        '''
+        A decorator replaying the recorded response of requests with an already seen idempotency key.
+
+        Can be used with or without parameters (``@api.idempotent`` or ``@api.idempotent(ttl=3600)``).
+
+        :param int ttl: How long responses are recorded in seconds
+            (default to the ``RESTPLUS_IDEMPOTENCY_TTL`` configuration)
+        :param list vary: The request headers scoping the keys (``Authorization`` and ``Cookie`` are always included)
+        :param CacheBackend store: The records store (default to :attr:`idempotency_store`)
+        :param float timeout: How long to wait for a duplicate request being processed
+            (default to the ``RESTPLUS_IDEMPOTENCY_TIMEOUT`` configuration)
+
+        See :class:`~flask_restplus.idempotency.idempotent`
+        '''
+        def wrapper(func):
+            func.__apidoc__ = merge(getattr(func, '__apidoc__', {}), {'__idempotent__': True})
+            return idempotent(self, ttl, vary, store, timeout)(func)
+        return wrapper(func) if func is not None else wrapper
+
+    @property
+    def idempotency_store(self):
+        '''
+        The default idempotency records store.
+
+        Default to the ``RESTPLUS_IDEMPOTENCY_STORE`` configuration
+        or to an in-process :class:`~flask_restplus.caching.MemoryCache`
+        of ``RESTPLUS_IDEMPOTENCY_SIZE`` records.
+        '''
+        store = current_app.config.get('RESTPLUS_IDEMPOTENCY_STORE')
+        if store is None:
+            if self._idempotency_store is None:
+                self._idempotency_store = MemoryCache(current_app.config.get('RESTPLUS_IDEMPOTENCY_SIZE', 1024))
+            store = self._idempotency_store
+        return store
+
+    def invalidate(self, resource, backend=None, **values):
+        '''
+        Invalidate the cached responses of a resource.
+
+        Without ``values``, all the resource entries are invalidated,
+        otherwise only those of the URL built from ``values``.
+        Requires an application context (and a request context for URL building).
+
+        :param Resource resource: The resource to invalidate
+        :param CacheBackend backend: The cache backend (default to :attr:`response_cache`)
+        '''
+        backend = backend or self.response_cache
+        endpoint = self.endpoint(resource.endpoint)
+        if values:
+            invalidate(backend, '{0}:{1}'.format(endpoint, self.url_for(resource, **values)))
+        else:
+            invalidate(backend, endpoint)
+
     def as_postman(self, urlvars=False, swagger=False):
         '''
         Serialize the API as Postman collection (v1)
@@ -565,15 +787,104 @@ class Api(restful.Api):
         '''
         return PostmanCollectionV1(self, swagger=swagger).as_dict(urlvars=urlvars)
 
+    def run_async(self, awaitable):
+        '''
+        Run an awaitable (ie. returned by an ``async def`` handler) until completion.
+
+        Each thread has its own event loop so the request context stays available.
+
+        :param awaitable: The awaitable to run
+        :return: the awaitable result
+        '''
+        if aio is None:
+            raise NotImplementedError('Asynchronous handlers require Python 3.5+')
+        return aio.run(awaitable, self._loops)
+
     @property
     def payload(self):
         '''Store the input payload in the current request context'''
-        return request.get_json()
+        return get_payload()
+
+    def freeze(self, app=None, gc_freeze=None, cache_file=None):
+        '''
+        Eagerly compute everything lazily computed on first requests
+        and prevent any further registration.
+
+        Models are resolved, their schemas, views and validators are compiled
+        and the Swagger specifications are built so configuration errors are raised
+        on startup and pre-forked workers share these artefacts.
+        Only the specifications base path, depending on the actual request
+        (ie. on ``SCRIPT_NAME``), is computed on the first request.
+
+        This is automatically called when ``RESTPLUS_EAGER`` is ``True``:
+        on :meth:`init_app`, on blueprint registration
+        or on the first request for APIs built with ``Api(app)``.
+
+        :param flask.Flask app: The application (default to the current one)
+        :param bool gc_freeze: Move all tracked objects into the permanent
+            garbage collector generation (Python 3.7+) to preserve copy-on-write sharing.
+            Default to the ``RESTPLUS_GC_FREEZE`` configuration.
+        :param str cache_file: An optional file to store the Swagger specifications
+            and models schemas into, reused while the API definition does not change.
+            On cache hit, models are resolved lazily (on first use).
+            Default to the ``RESTPLUS_CACHE_FILE`` configuration.
+        :raises SpecsError: on incoherent specifications
+        '''
+        if app is None:
+            app = current_app._get_current_object() if self.blueprint or not self.app else self.app
+        cache_file = cache_file or app.config.get('RESTPLUS_CACHE_FILE')
+        if gc_freeze is None:
+            gc_freeze = app.config.get('RESTPLUS_GC_FREEZE', False)
+        cached = None
+        if cache_file:
+            key = artefacts.definition_hash(self, app)
+            cached = artefacts.load(cache_file, key)
+        if cached:
+            for name, schema in six.iteritems(cached['schemas']):
+                self.models[name].__dict__['__schema__'] = schema
+            self._specs = cached['specs']
+        for model in self.models.values():
+            if not cached:
+                # Already checked when the cache was built: resolve lazily
+                model.projection()
+                model.compiled_views
+            model.__schema__
+            model.validator(self.refresolver)
+        if self._specs is None:
+            with app.test_request_context('/'):
+                specs = Swagger(self).as_dict()
+            specs.pop('basePath', None)
+            self._specs = specs
+        if cache_file and not cached:
+            artefacts.dump(cache_file, {
+                'hash': key,
+                'specs': self._specs,
+                'schemas': dict((name, model.__schema__) for name, model in six.iteritems(self.models)),
+            })
+        self._frozen = True
+        if gc_freeze and hasattr(gc, 'freeze'):
+            gc.collect()
+            gc.freeze()
+
+    @property
+    def frozen(self):
+        '''Whether or not this API has been frozen'''
+        return self._frozen
+
+    def _ensure_not_frozen(self):
+        if self._frozen:
+            raise SpecsError('Unable to register on a frozen API')
 
     @property
     def refresolver(self):
+        '''
+        The JSON schema references resolver used for payload validation.
+
+        It resolves references on registered models only
+        so it never requires the Swagger specifications.
+        '''
         if not self._refresolver:
-            self._refresolver = RefResolver.from_schema(self.__schema__)
+            self._refresolver = Definitions(self.models).resolver()
         return self._refresolver
 
 
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from inspect import isclass, isfunction, ismethod
+
+from six import iteritems, string_types, text_type
+
+from .model import Model
+from .representations import default
+
+log = logging.getLogger(__name__)
+
+__all__ = ('definition_hash', 'load', 'dump')
+
+#: Configuration keys having an impact on the specifications
+CONFIG_KEYS = ('SERVER_NAME', 'APPLICATION_ROOT', 'PREFERRED_URL_SCHEME')
+
+
+def qualname(obj):
+    return '.'.join((getattr(obj, '__module__', None) or '', getattr(obj, '__name__', None) or repr(obj)))
+
+
+def describe(obj, seen=None):
+    '''
+    Build a stable textual description of an API definition object.
+
+    Models are described by name only (they are described independently),
+    functions by their name, docstring and bytecode.
+    '''
+    seen = seen if seen is not None else set()
+    if obj is None or isinstance(obj, (bool, int, float) + string_types):
+        return repr(obj)
+    elif isinstance(obj, Model):
+        return 'Model({0})'.format(obj.name)
+    elif isinstance(obj, dict):
+        return '{{{0}}}'.format(','.join(sorted(
+            '{0}:{1}'.format(describe(k, seen), describe(v, seen)) for k, v in iteritems(obj)
+        )))
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = [describe(v, seen) for v in obj]
+        if isinstance(obj, (set, frozenset)):
+            items = sorted(items)
+        return '[{0}]'.format(','.join(items))
+    elif ismethod(obj):
+        return describe(getattr(obj, '__func__', obj), seen)
+    elif isfunction(obj):
+        code = obj.__code__
+        return 'function({0},{1},{2},{3})'.format(
+            qualname(obj), repr(obj.__doc__), hashlib.sha1(code.co_code).hexdigest(),
+            describe(getattr(obj, '__apidoc__', None), seen)
+        )
+    elif isclass(obj):
+        return 'class({0})'.format(qualname(obj))
+    elif id(obj) in seen:
+        return 'recursion({0})'.format(qualname(obj.__class__))
+    elif hasattr(obj, '__dict__'):
+        seen.add(id(obj))
+        attrs = dict((k, v) for k, v in iteritems(obj.__dict__) if not k.startswith('_'))
+        return '{0}({1})'.format(qualname(obj.__class__), describe(attrs, seen))
+    return '{0}({1})'.format(qualname(obj.__class__), text_type(obj))
+
+
+def definition_hash(api, app):
+    '''
+    Compute a hash of the API definition.
+
+    It changes whenever a model, a resource, a documentation
+    or a configuration having an impact on the specifications changes.
+
+    :param Api api: The API to hash
+    :param flask.Flask app: The application on which the API is attached
+    :rtype: str
+    '''
+    sha = hashlib.sha1()
+
+    def update(*values):
+        for value in values:
+            sha.update(describe(value).encode('utf8'))
+
+    update(api.version, api.title, api.description, api.terms_url,
+           api.contact, api.contact_email, api.contact_url, api.license, api.license_url,
+           api.authorizations, api.security, api.tags, api.default_id, api._validate,
+           list(api.representations.keys()))
+    update(api.blueprint.name if api.blueprint else None, getattr(api.blueprint, 'url_prefix', None),
+           getattr(api.blueprint, 'subdomain', None), api.prefix)
+    update(dict((k, v) for k, v in iteritems(app.config) if k.startswith('RESTPLUS_') or k in CONFIG_KEYS))
+    for name in sorted(api.models):
+        model = api.models[name]
+        update(name, model.__parent__.name if model.__parent__ else None,
+               text_type(model.__mask__) if model.__mask__ else None, model.__apidoc__,
+               dict((k, text_type(v)) for k, v in iteritems(model.__views__)),
+               dict(model))
+    for ns in api.namespaces:
+        update(ns.name, ns.description, ns.path)
+        for endpoint in sorted(ns.resources):
+            resource, urls, kwargs = ns.resources[endpoint]
+            methods = dict((m, getattr(resource, m.lower(), None)) for m in resource.methods or [])
+            update(endpoint, urls, kwargs, resource, getattr(resource, '__apidoc__', None), methods)
+    for exception, handler in iteritems(api._error_handlers):
+        update(exception, handler)
+    return sha.hexdigest()
+
+
+def load(filename, key):
+    '''
+    Load cached artefacts if they match the given definition hash.
+
+    Artefacts are stored as JSON so loading never executes code.
+
+    :param str filename: The cache file path
+    :param str key: The expected definition hash
+    :return: the artefacts dictionary or ``None`` if missing or outdated
+    '''
+    try:
+        with open(filename, 'rb') as cache:
+            artefacts = json.loads(cache.read().decode('utf8'))
+    except (IOError, OSError):
+        return None
+    except Exception:
+        log.warning('Unable to load API artefacts from %s', filename, exc_info=True)
+        return None
+    if not isinstance(artefacts, dict) or artefacts.get('hash') != key:
+        return None
+    return artefacts
+
+
+def dump(filename, artefacts):
+    '''
+    Atomically write artefacts into the cache file.
+
+    :param str filename: The cache file path
+    :param dict artefacts: The artefacts to store (including their ``hash``)
+    '''
+    dirname = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=dirname, prefix='.restplus-')
+    try:
+        with os.fdopen(fd, 'wb') as cache:
+            cache.write(json.dumps(artefacts, default=default).encode('utf8'))
+        os.rename(tmp, filename)
+    except Exception:
+        os.remove(tmp)
+        raise
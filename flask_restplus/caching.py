@@ -0,0 +1,742 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+import uuid
+
+from functools import wraps
+
+from flask import request, current_app
+from six import text_type
+from werkzeug.http import quote_etag, http_date
+from werkzeug.wrappers import Response
+
+from ._compat import aio, is_awaitable
+from .marshalling import SKIP_BODY, request_view
+from .mask import Mask, ParseError
+from .representations import get_backend
+from .utils import best_match, unpack, LRUCache
+
+
+__all__ = (
+    'etag', 'cached', 'coalesce', 'CacheControl',
+    'CacheBackend', 'MemoryCache', 'FileCache', 'SharedMemoryCache', 'SqliteCache',
+)
+
+
+def negotiated_mediatype(api=None):
+    '''The mediatype negotiated for the current request'''
+    accept = request.headers.get('Accept')
+    if api is None:
+        return accept
+    return best_match(accept, api.representations, default=api.default_mediatype)
+
+
+def variant():
+    '''The representation variant requested: fields mask and model view'''
+    mask = request.headers.get(current_app.config['RESTPLUS_MASK_HEADER'])
+    return mask, request_view()
+
+
+def make_etag(version, api=None):
+    '''
+    Compute an entity tag for a resource version.
+
+    The tag depends on the fields mask, the model view
+    and the negotiated mediatype of the current request.
+
+    :param version: The resource version (or its serialized body)
+    :param Api api: The API used to negotiate the mediatype
+    :rtype: str
+    '''
+    if not isinstance(version, bytes):
+        version = text_type(version).encode('utf8')
+    sha = hashlib.sha1(version)
+    mask, view = variant()
+    for value in mask, view, negotiated_mediatype(api):
+        sha.update(b'|')
+        sha.update((value or '').encode('utf8'))
+    return sha.hexdigest()
+
+
+def serialize(data):
+    '''A stable serialization of some response data'''
+    if isinstance(data, Response):
+        return data.get_data()
+    return get_backend().dumps(data, sort_keys=True).encode('utf8')
+
+
+def is_conditional():
+    return request.method in ('GET', 'HEAD')
+
+
+def not_modified(tag, weak=False):
+    '''Build a 304 response for an entity tag'''
+    return Response(status=304, headers={'ETag': quote_etag(tag, weak)})
+
+
+def add_etag(resp, tag, weak=False):
+    '''Add an entity tag header to a (Flask style) response'''
+    if isinstance(resp, Response):
+        resp.set_etag(tag, weak)
+        return resp
+    data, code, headers = unpack(resp)
+    headers = dict(headers)
+    headers['ETag'] = quote_etag(tag, weak)
+    return data, code, headers
+
+
+class etag(object):
+    '''
+    A decorator handling conditional requests with entity tags.
+
+    With a ``version`` function, the version is computed from the view arguments
+    before the handler so a matching ``If-None-Match`` returns a 304 without running it.
+    Otherwise, the tag is a hash of the serialized response body.
+
+    Tags include the fields mask, the model view and the negotiated mediatype.
+
+    :param callable version: An optional function computing a cheap resource version
+        from the view arguments (ie. an update timestamp)
+    :param bool weak: Whether or not tags are weak
+    :param Api api: The API used to negotiate mediatypes
+    '''
+    def __init__(self, version=None, weak=False, api=None):
+        self.version = version
+        self.weak = weak
+        self.api = api
+
+    def __call__(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if self.version is not None:
+                return self.from_version(f, args, kwargs)
+            return self.from_body(f, args, kwargs)
+        return wrapper
+
+    def from_version(self, f, args, kwargs):
+        tag = make_etag(self.version(**kwargs), self.api)
+        if is_conditional() and request.if_none_match.contains_weak(tag):
+            return not_modified(tag, self.weak)
+
+        resp = f(*args, **kwargs)
+
+        def output(resp):
+            return add_etag(resp, tag, self.weak)
+
+        return aio.then(resp, output) if is_awaitable(resp) else output(resp)
+
+    def from_body(self, f, args, kwargs):
+        # The body needs to be marshalled to be hashed, even for HEAD requests
+        skip_body = getattr(request, SKIP_BODY, False)
+        setattr(request, SKIP_BODY, False)
+        try:
+            resp = f(*args, **kwargs)
+        finally:
+            setattr(request, SKIP_BODY, skip_body)
+
+        def output(resp):
+            data, code, headers = (resp, resp.status_code, None) if isinstance(resp, Response) else unpack(resp)
+            if not 200 <= code < 300:
+                return resp
+            tag = make_etag(serialize(data), self.api)
+            if is_conditional() and request.if_none_match.contains_weak(tag):
+                return not_modified(tag, self.weak)
+            return add_etag(resp, tag, self.weak)
+
+        return aio.then(resp, output) if is_awaitable(resp) else output(resp)
+
+
+class CacheBackend(object):
+    '''
+    The response cache backends interface.
+
+    Keys are strings and values are picklable.
+    '''
+    def get(self, key):
+        '''Get a value by its key, ``None`` if missing or expired'''
+        raise NotImplementedError()
+
+    def set(self, key, value, ttl=None):
+        '''Store a value for ``ttl`` seconds (forever if ``None``)'''
+        raise NotImplementedError()
+
+    def add(self, key, value, ttl=None):
+        '''
+        Store a value only if the key is missing (or expired).
+
+        This default implementation is not atomic, backends should override it when possible.
+
+        :return: ``True`` if the value has been stored
+        '''
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    def delete(self, key):
+        '''Remove a value by its key'''
+        raise NotImplementedError()
+
+    def clear(self):
+        '''Remove all values'''
+        raise NotImplementedError()
+
+
+def expiration(ttl):
+    return time.time() + ttl if ttl else None
+
+
+def is_expired(expires):
+    return expires is not None and expires <= time.time()
+
+
+class MemoryCache(CacheBackend):
+    '''
+    An in-process cache backend evicting the least recently used entries.
+
+    :param int size: The maximum number of entries
+    '''
+    def __init__(self, size=1024):
+        self._data = LRUCache(size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if is_expired(expires):
+            self._data.pop(key)
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        self._data.set(key, (expiration(ttl), value))
+
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            return super(MemoryCache, self).add(key, value, ttl)
+
+    def delete(self, key):
+        self._data.pop(key)
+
+    def clear(self):
+        self._data.clear()
+
+
+class FileCache(CacheBackend):
+    '''
+    A local file cache backend, shared by the processes of the same host.
+
+    Each entry is pickled in its own file, written atomically.
+    As entries are unpickled, the directory should only be accessible by the current user:
+    it is created with the ``0700`` mode and an existing one is refused
+    if it is owned by another user or accessible by group or others.
+
+    :param str directory: The directory holding the entries (created if necessary)
+    '''
+    suffix = '.restplus-cache'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._checked = False
+
+    def check(self, create=False):
+        '''
+        Ensure the directory is private to the current user.
+
+        :param bool create: Create the directory if it does not exist
+        :return: ``True`` if the directory exists and is safe to use
+        :raises OSError: if the directory is not safe to use
+        '''
+        if self._checked:
+            return True
+        try:
+            infos = os.lstat(self.directory)
+        except OSError:
+            if not create:
+                return False
+            os.makedirs(self.directory, 0o700)
+            infos = os.lstat(self.directory)
+        if not stat.S_ISDIR(infos.st_mode):
+            raise OSError('Cache directory {0} is not a directory'.format(self.directory))
+        if os.name == 'posix' and (infos.st_uid != os.getuid() or infos.st_mode & 0o077):
+            raise OSError('Cache directory {0} should be owned by the current user with the 0700 mode'.format(
+                self.directory
+            ))
+        self._checked = True
+        return True
+
+    def filename(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf8')).hexdigest() + self.suffix)
+
+    def get(self, key):
+        if not self.check():
+            return None
+        try:
+            with open(self.filename(key), 'rb') as entry:
+                expires, value = pickle.load(entry)
+        except Exception:
+            return None
+        if is_expired(expires):
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.check(create=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.restplus-')
+        try:
+            with os.fdopen(fd, 'wb') as entry:
+                pickle.dump((expiration(ttl), value), entry, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp, self.filename(key))
+        except Exception:
+            os.remove(tmp)
+            raise
+
+    def delete(self, key):
+        if not self.check():
+            return
+        try:
+            os.remove(self.filename(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        if not self.check():
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+class SharedMemoryCache(FileCache):
+    '''
+    A file cache backend stored in shared memory (the ``/dev/shm`` tmpfs on Linux)
+    so pre-forked workers share entries without disk I/O.
+
+    Fallback on the temporary directory when ``/dev/shm`` is not available.
+    The directory name includes the current user id so users never share it.
+
+    :param str name: The cache name (default to the current application import name)
+    '''
+    def __init__(self, name=None):
+        self.name = name
+        self._directory = None
+        self._checked = False
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            root = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+            uid = os.getuid() if hasattr(os, 'getuid') else 0
+            name = self.name or current_app.import_name
+            self._directory = os.path.join(root, 'restplus-{0}-{1}'.format(uid, name))
+        return self._directory
+
+
+class SqliteCache(CacheBackend):
+    '''
+    A SQLite cache backend, shared by the processes of the same host.
+
+    Each thread uses its own connection.
+
+    :param str filename: The database file path
+    :param str table: The table holding the entries (created if necessary)
+    '''
+    def __init__(self, filename, table='restplus_cache'):
+        self.filename = filename
+        self.table = table
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.filename, timeout=30, isolation_level=None)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS {0} (key TEXT PRIMARY KEY, expires REAL, value BLOB)'.format(self.table)
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = self.connection.execute(
+            'SELECT expires, value FROM {0} WHERE key = ?'.format(self.table), (key, )
+        ).fetchone()
+        if row is None:
+            return None
+        expires, value = row
+        if is_expired(expires):
+            self.delete(key)
+            return None
+        return pickle.loads(bytes(value))
+
+    def set(self, key, value, ttl=None):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO {0} (key, expires, value) VALUES (?, ?, ?)'.format(self.table),
+            (key, expiration(ttl), sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        )
+
+    def add(self, key, value, ttl=None):
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'DELETE FROM {0} WHERE key = ? AND expires <= ?'.format(self.table), (key, time.time())
+            )
+            cursor = connection.execute(
+                'INSERT OR IGNORE INTO {0} (key, expires, value) VALUES (?, ?, ?)'.format(self.table),
+                (key, expiration(ttl), sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        self.connection.execute('DELETE FROM {0} WHERE key = ?'.format(self.table), (key, ))
+
+    def clear(self):
+        self.connection.execute('DELETE FROM {0}'.format(self.table))
+
+
+def generation(backend, scope):
+    '''The current generation token of a cache scope, bumped on invalidation'''
+    key = 'restplus:generation:{0}'.format(scope)
+    token = backend.get(key)
+    if token is None:
+        token = invalidate(backend, scope)
+    return token
+
+
+def invalidate(backend, scope):
+    '''Invalidate all the entries of a cache scope by starting a new generation'''
+    token = uuid.uuid4().hex
+    backend.set('restplus:generation:{0}'.format(scope), token)
+    return token
+
+
+def parsed_mask():
+    '''The normalized fields mask of the current request'''
+    mask = request.headers.get(current_app.config['RESTPLUS_MASK_HEADER'])
+    if not mask:
+        return None
+    try:
+        return text_type(Mask(mask))
+    except ParseError:
+        return mask
+
+
+def negotiate(api, resource=None):
+    '''The mediatype negotiated for the current request by a resource or the API'''
+    accept = request.headers.get('Accept')
+    representations = getattr(resource, 'representations', None)
+    mediatype = best_match(accept, representations) if representations else None
+    return mediatype or best_match(accept, api.representations, default=api.default_mediatype)
+
+
+def serialize_response(api, resource, mediatype, resp):
+    '''Serialize a (Flask style) handler response like the resource dispatch would'''
+    if isinstance(resp, Response):
+        return resp
+    data, code, headers = unpack(resp)
+    representations = getattr(resource, 'representations', None) or {}
+    if mediatype in representations:
+        response = representations[mediatype](data, code, headers)
+        response.headers['Content-Type'] = mediatype
+        return response
+    return api.make_response(data, code, headers=headers)
+
+
+def dump_response(response):
+    '''Extract a picklable ``(status, headers, body)`` tuple from a response'''
+    return response.status_code, list(response.headers.items()), response.get_data()
+
+
+def load_response(entry):
+    '''Build a new response from a ``(status, headers, body)`` tuple'''
+    status, headers, body = entry
+    return current_app.response_class(body, status=status, headers=headers)
+
+
+def request_key(mediatype, *parts):
+    '''
+    Compute a key identifying the response variant of the current request.
+
+    It includes the URL (with the query string), the parsed fields mask,
+    the model view, the negotiated mediatype and some extra parts.
+    '''
+    sha = hashlib.sha1()
+    path = request.script_root + request.path
+    args = repr(sorted(request.args.items(multi=True)))
+    for part in (path, args, parsed_mask(), request_view(), mediatype) + parts:
+        sha.update((part or '').encode('utf8'))
+        sha.update(b'|')
+    return sha.hexdigest()
+
+
+class with_body(object):
+    '''A context manager ensuring the body is built, even for ``HEAD`` requests'''
+    def __enter__(self):
+        self.skip_body = getattr(request, SKIP_BODY, False)
+        setattr(request, SKIP_BODY, False)
+
+    def __exit__(self, *args):
+        setattr(request, SKIP_BODY, self.skip_body)
+
+
+#: The request headers always keying cached responses as they may identify the user
+PRIVATE_HEADERS = ('Authorization', 'Cookie')
+
+
+def key_headers(vary):
+    '''The request headers keying a response: the ``vary`` ones and the :data:`PRIVATE_HEADERS`'''
+    vary = list(vary or [])
+    names = set(header.lower() for header in vary)
+    return vary + [header for header in PRIVATE_HEADERS if header.lower() not in names]
+
+
+class cached(object):
+    '''
+    A decorator caching the serialized responses of ``GET`` (and ``HEAD``) requests.
+
+    Entries are keyed by URL (including the query string), parsed fields mask,
+    model view, negotiated mediatype and the ``vary`` headers values.
+    The ``Authorization`` and ``Cookie`` headers are always part of the key
+    so authenticated responses are never shared between users.
+    Only ``200`` responses without cookies are cached.
+
+    :param Api api: The API serializing responses
+    :param int ttl: The entries time to live in seconds
+        (default to the ``RESTPLUS_RESPONSE_CACHE_TTL`` configuration)
+    :param list vary: The request headers to include in the key
+    :param CacheBackend backend: The cache backend (default to :attr:`Api.response_cache`)
+    '''
+    def __init__(self, api, ttl=None, vary=None, backend=None):
+        self.api = api
+        self.ttl = ttl
+        self.vary = list(vary or [])
+        self.headers = key_headers(self.vary)
+        self.backend = backend
+
+    def __call__(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not is_conditional():
+                return f(*args, **kwargs)
+            resource = args[0] if args else None
+            backend = self.backend or self.api.response_cache
+            mediatype = negotiate(self.api, resource)
+            key = self.key(backend, mediatype)
+            entry = backend.get(key)
+            if entry is not None:
+                return load_response(entry)
+
+            with with_body():
+                resp = f(*args, **kwargs)
+
+            def output(resp):
+                response = serialize_response(self.api, resource, mediatype, resp)
+                if response.status_code == 200 and not response.is_streamed and 'Set-Cookie' not in response.headers:
+                    ttl = self.ttl
+                    if ttl is None:
+                        ttl = current_app.config.get('RESTPLUS_RESPONSE_CACHE_TTL', 300)
+                    backend.set(key, dump_response(response), ttl)
+                return response
+
+            return aio.then(resp, output) if is_awaitable(resp) else output(resp)
+        return wrapper
+
+    def key(self, backend, mediatype):
+        path = request.script_root + request.path
+        key = request_key(
+            mediatype,
+            generation(backend, request.endpoint),
+            generation(backend, '{0}:{1}'.format(request.endpoint, path)),
+            *[request.headers.get(header) for header in self.headers]
+        )
+        return 'restplus:response:{0}'.format(key)
+
+
+class Flight(object):
+    '''An in-flight computation shared by concurrent identical requests'''
+    __slots__ = ('done', 'entry', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+class coalesce(object):
+    '''
+    A decorator coalescing concurrent identical ``GET`` (and ``HEAD``) requests.
+
+    Requests are identical if they share the same URL (including the query string),
+    parsed fields mask, model view, negotiated mediatype and ``vary`` headers values
+    (as well as the ``Authorization`` and ``Cookie`` ones, see :class:`cached`).
+    The first one runs the handler while the others wait for its serialized response,
+    or its error which is raised for all of them.
+
+    :param Api api: The API serializing responses
+    :param float timeout: How long to wait for the in-flight computation before running the handler
+        (default to the ``RESTPLUS_COALESCE_TIMEOUT`` configuration)
+    :param list vary: The request headers to include in the key
+    '''
+    def __init__(self, api, timeout=None, vary=None):
+        self.api = api
+        self.timeout = timeout
+        self.headers = key_headers(vary)
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not is_conditional():
+                return f(*args, **kwargs)
+            resource = args[0] if args else None
+            mediatype = negotiate(self.api, resource)
+            key = request_key(mediatype, *[request.headers.get(header) for header in self.headers])
+
+            with self.lock:
+                flight = self.flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self.flights[key] = Flight()
+
+            if leader:
+                return self.lead(flight, key, f, args, kwargs, resource, mediatype)
+
+            timeout = self.timeout
+            if timeout is None:
+                timeout = current_app.config.get('RESTPLUS_COALESCE_TIMEOUT', 30)
+            if flight.done.wait(timeout):
+                if flight.error is not None:
+                    raise flight.error
+                if flight.entry is not None:
+                    return load_response(flight.entry)
+            # Too slow or not shareable: compute the response on our own
+            with with_body():
+                return self.run(f, args, kwargs, resource, mediatype)
+        return wrapper
+
+    def run(self, f, args, kwargs, resource, mediatype):
+        resp = f(*args, **kwargs)
+        if is_awaitable(resp):
+            resp = self.api.run_async(resp)
+        return serialize_response(self.api, resource, mediatype, resp)
+
+    def lead(self, flight, key, f, args, kwargs, resource, mediatype):
+        try:
+            with with_body():
+                response = self.run(f, args, kwargs, resource, mediatype)
+            if not response.is_streamed:
+                flight.entry = dump_response(response)
+            return response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+            flight.done.set()
+
+
+#: The request attribute holding the cache control policy of the dispatched handler
+CACHE_CONTROL = '_restplus_cache_control'
+
+
+class CacheControl(object):
+    '''
+    A precompiled HTTP caching headers policy.
+
+    It sets the ``Cache-Control``, ``Expires`` and ``Vary`` headers of responses
+    unless the handler already set them.
+
+    :param int max_age: The ``max-age`` directive (also used to compute ``Expires``)
+    :param int s_maxage: The ``s-maxage`` directive for shared caches
+    :param bool public: The ``public`` directive
+    :param bool private: The ``private`` directive
+    :param bool no_cache: The ``no-cache`` directive
+    :param bool no_store: The ``no-store`` directive
+    :param bool must_revalidate: The ``must-revalidate`` directive
+    :param bool immutable: The ``immutable`` directive
+    :param int stale_while_revalidate: The ``stale-while-revalidate`` directive
+    :param list vary: The request headers the response varies on
+    :param bool expires: Whether or not to send an ``Expires`` header along ``max_age``
+    :param bool errors: Whether or not to apply the policy on error responses (4xx and 5xx)
+    '''
+    def __init__(self, max_age=None, s_maxage=None, public=False, private=False, no_cache=False,
+                 no_store=False, must_revalidate=False, immutable=False, stale_while_revalidate=None,
+                 vary=None, expires=True, errors=False):
+        directives = []
+        for flag, directive in ((public, 'public'), (private, 'private'), (no_cache, 'no-cache'),
+                                (no_store, 'no-store'), (must_revalidate, 'must-revalidate')):
+            if flag:
+                directives.append(directive)
+        for value, directive in ((max_age, 'max-age'), (s_maxage, 's-maxage'),
+                                 (stale_while_revalidate, 'stale-while-revalidate')):
+            if value is not None:
+                directives.append('{0}={1}'.format(directive, int(value)))
+        if immutable:
+            directives.append('immutable')
+        self.cache_control = ', '.join(directives) or None
+        self.vary = ', '.join(vary) if vary else None
+        self.max_age = max_age if expires else None
+        self.errors = errors
+
+    def applies(self, code):
+        '''Whether or not the policy applies to a response status code'''
+        return code < 400 or self.errors
+
+    def headers(self):
+        '''The headers to set on the current response'''
+        headers = []
+        if self.cache_control:
+            headers.append(('Cache-Control', self.cache_control))
+        if self.max_age is not None:
+            headers.append(('Expires', http_date(time.time() + self.max_age)))
+        if self.vary:
+            headers.append(('Vary', self.vary))
+        return headers
+
+    def apply(self, resp):
+        '''Set the caching headers on a (Flask style) response'''
+        if isinstance(resp, Response):
+            if self.applies(resp.status_code):
+                for name, value in self.headers():
+                    if name not in resp.headers:
+                        resp.headers[name] = value
+            return resp
+        data, code, headers = unpack(resp)
+        if not self.applies(code):
+            return resp
+        headers = dict(headers)
+        for name, value in self.headers():
+            headers.setdefault(name, value)
+        return data, code, headers
+
+    def headers_schema(self):
+        '''The Swagger response headers specifications'''
+        headers = {}
+        if self.cache_control:
+            headers['Cache-Control'] = {'type': 'string', 'default': self.cache_control}
+        if self.max_age is not None:
+            headers['Expires'] = {'type': 'string', 'description': 'The response expiration date'}
+        if self.vary:
+            headers['Vary'] = {'type': 'string', 'default': self.vary}
+        return headers
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+'''
+Deferred fields values resolution.
+
+Fields values may be awaitables or :class:`concurrent.futures.Future`
+and nested fields may declare a batch loader.
+During a :func:`~flask_restplus.marshal` call, they are collected across the whole response
+and resolved concurrently (or loaded once per loader) before the output is built.
+'''
+from __future__ import unicode_literals
+
+import threading
+import warnings
+
+from collections import Mapping
+from flask import current_app, has_app_context
+
+from ._compat import OrderedDict, aio, is_awaitable
+
+try:
+    from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+except ImportError:  # Python 2 without the futures backport
+    Future = ThreadPoolExecutor = wait_futures = None
+
+
+__all__ = ('is_deferred', 'defer', 'load', 'collect', 'collected')
+
+_local = threading.local()
+_loops = threading.local()
+_executor = []
+
+
+def is_deferred(value):
+    '''Whether or not a field value should be resolved later'''
+    return (Future is not None and isinstance(value, Future)) or is_awaitable(value)
+
+
+def get_executor():
+    '''
+    The executor used to run awaitables event loops from a running event loop.
+
+    Default to the ``RESTPLUS_MARSHAL_EXECUTOR`` configuration
+    or to a shared thread pool.
+    '''
+    executor = current_app.config.get('RESTPLUS_MARSHAL_EXECUTOR') if has_app_context() else None
+    if executor is None:
+        if not _executor:
+            _executor.append(ThreadPoolExecutor(max_workers=4))
+        executor = _executor[0]
+    return executor
+
+
+def wait(values):
+    '''
+    Wait for deferred values concurrently.
+
+    :param list values: The futures and awaitables to wait for
+    :return: an ``(error, result)`` tuple for each value
+    '''
+    results = [None] * len(values)
+    futures, awaitables = [], []
+    for i, value in enumerate(values):
+        (futures if Future is not None and isinstance(value, Future) else awaitables).append((i, value))
+
+    if awaitables:
+        resolved = aio.resolve([v for _, v in awaitables], _loops, get_executor)
+        for (i, _), result in zip(awaitables, resolved):
+            results[i] = result
+    if futures:
+        wait_futures([f for _, f in futures])
+        for i, future in futures:
+            error = future.exception()
+            results[i] = (error, None) if error is not None else (None, future.result())
+    return results
+
+
+def fail(error):
+    from .fields import MarshallingError
+    if isinstance(error, MarshallingError):
+        raise error
+    raise MarshallingError(error)
+
+
+class Deferred(object):
+    '''A placeholder for a value computed once its deferred source is resolved'''
+    __slots__ = ('value', 'callback', 'result')
+
+    def __init__(self, value, callback):
+        self.value = value
+        self.callback = callback
+
+
+def load_batch(loader, keys):
+    '''
+    Call a batch loader once for all the given keys.
+
+    :param callable loader: The batch loader, returning a mapping by key
+        (or a list of values, which must be in the same order than the keys)
+    :param list keys: The keys to load (duplicates are loaded once)
+    :return: a function returning the loaded value for a key
+    :raises MarshallingError: if the loader fails
+    '''
+    keys = list(OrderedDict.fromkeys(keys))
+    try:
+        loaded = loader(keys)
+    except Exception as e:
+        fail(e)
+    if isinstance(loaded, Mapping):
+        return loaded.get
+    warnings.warn(
+        'Loader {0} returned a list: its values are matched to the keys by position '
+        'so they must be in the same order (prefer returning a mapping by key)'.format(
+            getattr(loader, '__name__', loader)
+        ), UserWarning
+    )
+    loaded = list(loaded)
+    if len(loaded) != len(keys):
+        fail('Loader {0} returned {1} values for {2} keys'.format(
+            getattr(loader, '__name__', loader), len(loaded), len(keys)
+        ))
+    return dict(zip(keys, loaded)).get
+
+
+class Collector(object):
+    '''Collect deferred values and batch loads during a marshalling'''
+    def __init__(self):
+        self.pending = []
+        self.batches = OrderedDict()
+        self.count = 0
+
+    def defer(self, value, callback):
+        deferred = Deferred(value, callback)
+        self.pending.append(deferred)
+        self.count += 1
+        return deferred
+
+    def load(self, loader, keys, callback):
+        deferred = Deferred(keys, callback)
+        self.batches.setdefault(loader, []).append(deferred)
+        self.count += 1
+        return deferred
+
+    def activate(self):
+        '''Collect the values deferred while resolving (ie. outside of the collection context)'''
+        previous = getattr(_local, 'collector', None)
+        _local.collector = self
+        return previous
+
+    def load_batches(self):
+        '''Run the batch loads collected so far and return the pending deferred values'''
+        previous = self.activate()
+        try:
+            batches, self.batches = self.batches, OrderedDict()
+            for loader, deferreds in batches.items():
+                get = load_batch(loader, [key for deferred in deferreds for key in deferred.value])
+                for deferred in deferreds:
+                    deferred.result = deferred.callback([get(key) for key in deferred.value])
+        finally:
+            _local.collector = previous
+        pending, self.pending = self.pending, []
+        return pending
+
+    def settle(self, pending, results):
+        '''Compute the outputs of pending deferred values from their ``(error, result)`` tuples'''
+        previous = self.activate()
+        try:
+            for deferred, (error, result) in zip(pending, results):
+                if error is not None:
+                    fail(error)
+                deferred.result = deferred.callback(result)
+        finally:
+            _local.collector = previous
+
+    def resolve(self, out):
+        '''Resolve all pending values (including those deferred while resolving) and build the output'''
+        if not self.pending and not self.batches:
+            return out
+        while self.pending or self.batches:
+            pending = self.load_batches()
+            self.settle(pending, wait([d.value for d in pending]))
+        return substitute(out)
+
+    def resolve_async(self, out):
+        '''
+        Resolve all pending values on the event loop running in the current thread.
+
+        :return: an awaitable of the output if some values are pending, the output otherwise
+        '''
+        if not self.pending and not self.batches:
+            return out
+        return aio.then(aio.drain(self), lambda _: substitute(out))
+
+
+def substitute(out):
+    '''Replace resolved placeholders in an output tree'''
+    while isinstance(out, Deferred):
+        out = out.result
+    if isinstance(out, dict):
+        for key, value in out.items():
+            out[key] = substitute(value)
+    elif isinstance(out, list):
+        for idx, value in enumerate(out):
+            out[idx] = substitute(value)
+    return out
+
+
+def defer(value, callback):
+    '''
+    Defer the computation of a field output until its value is resolved.
+
+    Outside of a marshalling, the value is resolved immediately.
+
+    :param value: The awaitable or future field value
+    :param callable callback: Compute the field output from the resolved value
+    :raises MarshallingError: if the value resolution fails
+    '''
+    collector = getattr(_local, 'collector', None)
+    if collector is not None:
+        return collector.defer(value, callback)
+    (error, result), = wait([value])
+    if error is not None:
+        fail(error)
+    return callback(result)
+
+
+def load(loader, keys, callback):
+    '''
+    Batch the loading of some keys with all the others of the same loader.
+
+    Outside of a marshalling, the keys are loaded immediately.
+
+    :param callable loader: The batch loader
+    :param list keys: The keys to load
+    :param callable callback: Compute the field output from the list of loaded values
+    :raises MarshallingError: if the loader fails
+    '''
+    collector = getattr(_local, 'collector', None)
+    if collector is not None:
+        return collector.load(loader, keys, callback)
+    get = load_batch(loader, keys)
+    return callback([get(key) for key in keys])
+
+
+def collected():
+    '''The number of values collected so far by the current marshalling'''
+    collector = getattr(_local, 'collector', None)
+    return 0 if collector is None else collector.count
+
+
+class collect(object):
+    '''
+    A context manager collecting deferred values during a marshalling.
+
+    Only the outermost one collects, nested ones are no-ops.
+    Values deferred while resolving are collected and resolved too,
+    so :meth:`resolve` should be called within the context.
+    '''
+    def __enter__(self):
+        self.collector = None
+        if getattr(_local, 'collector', None) is None:
+            self.collector = _local.collector = Collector()
+        return self
+
+    def __exit__(self, *args):
+        if self.collector is not None:
+            _local.collector = None
+
+    def resolve(self, out):
+        '''Resolve the collected values (for the outermost collection only)'''
+        return out if self.collector is None else self.collector.resolve(out)
+
+    def resolve_async(self, out):
+        '''Resolve the collected values on the running event loop (see :meth:`Collector.resolve_async`)'''
+        return out if self.collector is None else self.collector.resolve_async(out)
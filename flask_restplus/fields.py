@@ -5,6 +5,7 @@ from calendar import timegm
 from datetime import date, datetime
 from decimal import Decimal, ROUND_HALF_EVEN
 from email.utils import formatdate
+from itertools import islice
 
 from six import iteritems, itervalues, text_type, string_types
 
@@ -13,8 +14,10 @@ from werkzeug import cached_property
 
 from ._compat import urlparse, urlunparse
 from .inputs import date_from_iso8601, datetime_from_iso8601, datetime_from_rfc822
+from .deferred import defer, is_deferred, load
 from .errors import RestError
 from .marshalling import marshal
+from .mask import Mask
 from .utils import camel_to_dash, not_none
 
 
@@ -65,6 +68,21 @@ def _get_value_for_key(key, obj, default):
     return getattr(obj, key, default)
 
 
+def limit_items(value, limit):
+    '''
+    Truncate an iterable to its ``limit`` first items.
+
+    Slicing is used when possible so lazy sequences (ie. ORM queries)
+    can push the limit down to the data layer.
+    '''
+    if limit is None:
+        return value
+    try:
+        return list(value[:limit])
+    except (TypeError, KeyError):
+        return list(islice(value, limit))
+
+
 def to_marshallable_type(obj):
     '''
     Helper for converting an object to a dictionary only if it is not
@@ -148,7 +166,12 @@ class Raw(object):
         '''
 
         value = get_value(key if self.attribute is None else self.attribute, obj)
+        if is_deferred(value):
+            return defer(value, self.output_value)
+        return self.output_value(value)
 
+    def output_value(self, value):
+        '''Format an already extracted value, using the default if ``None``'''
         if value is None:
             default = self._v('default')
             return self.format(default) if default else default
@@ -189,13 +212,23 @@ class Nested(Raw):
         dictionary will be marshaled as its value if nested dictionary is
         all-null keys (e.g. lets you return an empty JSON object instead of
         null)
+    :param int limit: The maximum number of items to marshal when ``as_list`` is ``True``
+    :param callable loader: An optional batch loader: the field value is then a key
+        (or a list of keys when ``as_list`` is ``True``) and all the keys of a response
+        are loaded with a single call taking the list of keys and returning a mapping by key
+        (a list of objects is matched by position so it must be in the same order than the keys)
     '''
     __schema_type__ = None
 
-    def __init__(self, model, allow_null=False, as_list=False, **kwargs):
+    #: The mask applied to a cached model (masked models are copied otherwise)
+    model_mask = None
+
+    def __init__(self, model, allow_null=False, as_list=False, limit=None, loader=None, **kwargs):
         self.model = model
         self.as_list = as_list
         self.allow_null = allow_null
+        self.limit = limit
+        self.loader = loader
         super(Nested, self).__init__(**kwargs)
 
     @property
@@ -204,13 +237,29 @@ class Nested(Raw):
 
     def output(self, key, obj):
         value = get_value(key if self.attribute is None else self.attribute, obj)
+        if is_deferred(value):
+            return defer(value, self.output_value)
+        return self.output_value(value)
+
+    def output_value(self, value):
+        if self.loader is not None and value is not None:
+            if not self.as_list:
+                return load(self.loader, [value], lambda values: self.output_loaded(values[0]))
+            keys = limit_items(value, self.limit) if is_indexable_but_not_string(value) else [value]
+            return load(self.loader, list(keys), self.output_loaded)
+        return self.output_loaded(value)
+
+    def output_loaded(self, value):
         if value is None:
             if self.allow_null:
                 return None
             elif self.default is not None:
                 return self.default
 
-        return marshal(value, self.nested)
+        if self.as_list and self.limit is not None and is_indexable_but_not_string(value):
+            value = limit_items(value, self.limit)
+
+        return marshal(value, self.model, mask=self.model_mask)
 
     def schema(self):
         schema = super(Nested, self).schema()
@@ -229,9 +278,19 @@ class Nested(Raw):
     def clone(self, mask=None):
         kwargs = self.__dict__.copy()
         model = kwargs.pop('model')
-        if mask:
+        kwargs.pop('model_mask', None)
+        model_mask = None
+        if mask and getattr(model, '__cache__', None):
+            # Keep cached models so their outputs are reused by mask
+            model.projection(mask)
+            model_mask = mask
+        elif mask:
             model = mask.apply(model.resolved if hasattr(model, 'resolved') else model)
-        return self.__class__(model, **kwargs)
+        if mask is not None and 'limit' in mask.args:
+            kwargs['limit'] = mask.args['limit']
+        clone = self.__class__(model, **kwargs)
+        clone.model_mask = model_mask
+        return clone
 
 
 class List(Raw):
@@ -241,11 +300,13 @@ class List(Raw):
     See :ref:`list-field` for more information.
 
     :param cls_or_instance: The field type the list will contain.
+    :param int limit: The maximum number of items to marshal
     '''
     def __init__(self, cls_or_instance, **kwargs):
         self.min_items = kwargs.pop('min_items', None)
         self.max_items = kwargs.pop('max_items', None)
         self.unique = kwargs.pop('unique', None)
+        self.limit = kwargs.pop('limit', None)
         super(List, self).__init__(**kwargs)
         error_msg = 'The type of the list elements must be a subclass of fields.Raw'
         if isinstance(cls_or_instance, type):
@@ -261,6 +322,8 @@ class List(Raw):
         # Convert all instances in typed list to container type
         if isinstance(value, set):
             value = list(value)
+        if self.limit is not None:
+            value = limit_items(value, self.limit)
 
         is_nested = isinstance(self.container, Nested) or type(self.container) is Raw
 
@@ -275,6 +338,11 @@ class List(Raw):
 
     def output(self, key, data):
         value = get_value(key if self.attribute is None else self.attribute, data)
+        if is_deferred(value):
+            return defer(value, self.output_value)
+        return self.output_value(value)
+
+    def output_value(self, value):
         # we cannot really test for external dict behavior
         if is_indexable_but_not_string(value) and not isinstance(value, dict):
             return self.format(value)
@@ -297,7 +365,10 @@ class List(Raw):
         kwargs = self.__dict__.copy()
         model = kwargs.pop('container')
         if mask:
-            model = mask.apply(model)
+            # Arguments (ie. ``limit``) apply to the list, not to its items
+            model = Mask(mask, mask.skip, args={}).apply(model)
+        if mask is not None and 'limit' in mask.args:
+            kwargs['limit'] = mask.args['limit']
         return self.__class__(model, **kwargs)
 
 
@@ -666,7 +737,7 @@ class Polymorph(Nested):
         elif len(candidates) > 1:
             raise ValueError('Unable to determine a candidate for: ' + value.__class__.__name__)
         else:
-            return marshal(value, candidates[0].resolved, mask=self.mask)
+            return marshal(value, candidates[0], mask=self.mask)
 
     def resolve_ancestor(self, fields):
         '''
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+'''
+Idempotency keys support.
+
+Clients send an ``Idempotency-Key`` header with their unsafe requests
+so retries replay the recorded response instead of running the handler again.
+'''
+from __future__ import unicode_literals
+
+import hashlib
+import threading
+
+from functools import wraps
+
+from flask import request, current_app
+
+from ._compat import is_awaitable
+from .caching import Flight, key_headers, negotiate, serialize_response, dump_response, load_response
+from .errors import abort
+
+
+__all__ = ('idempotent', )
+
+#: The recorded state of a request still being processed
+PENDING = 'pending'
+#: The recorded state of a processed request
+DONE = 'done'
+
+
+class idempotent(object):
+    '''
+    A decorator replaying the recorded response of requests with an already seen idempotency key.
+
+    The key is read from the ``RESTPLUS_IDEMPOTENCY_HEADER`` header (``Idempotency-Key`` by default)
+    and scoped by endpoint, HTTP method, URL and the ``vary`` headers values
+    (as well as the ``Authorization`` and ``Cookie`` ones so users never share keys).
+    Requests without key are processed as usual.
+
+    Duplicates of a request being processed wait for it in the same process
+    while a ``409 Conflict`` is returned if it is processed by another one.
+    Reusing a key with another payload is rejected with a ``422 Unprocessable Entity``.
+    Responses with a 5xx status code and raised errors are not recorded so they can be retried.
+
+    :param Api api: The API serializing responses
+    :param int ttl: How long responses are recorded in seconds
+        (default to the ``RESTPLUS_IDEMPOTENCY_TTL`` configuration)
+    :param list vary: The request headers scoping the keys (ie. ``Accept-Language``)
+    :param CacheBackend store: The records store (default to :attr:`Api.idempotency_store`)
+    :param float timeout: How long to wait for a duplicate request being processed
+        (default to the ``RESTPLUS_IDEMPOTENCY_TIMEOUT`` configuration)
+    '''
+    def __init__(self, api, ttl=None, vary=None, store=None, timeout=None):
+        self.api = api
+        self.ttl = ttl
+        self.vary = list(vary or [])
+        self.headers = key_headers(self.vary)
+        self.store = store
+        self.timeout = timeout
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            token = request.headers.get(current_app.config.get('RESTPLUS_IDEMPOTENCY_HEADER', 'Idempotency-Key'))
+            if not token:
+                return f(*args, **kwargs)
+            key = self.key(token)
+            timeout = self.timeout if self.timeout is not None else current_app.config.get(
+                'RESTPLUS_IDEMPOTENCY_TIMEOUT', 60
+            )
+
+            # Duplicates are processed one at a time in a process
+            while True:
+                with self.lock:
+                    flight = self.flights.get(key)
+                    if flight is None:
+                        flight = self.flights[key] = Flight()
+                        break
+                if not flight.done.wait(timeout):
+                    abort(409, 'A request with the same idempotency key is being processed')
+
+            try:
+                return self.process(key, timeout, f, args, kwargs)
+            finally:
+                with self.lock:
+                    self.flights.pop(key, None)
+                flight.done.set()
+        return wrapper
+
+    def key(self, token):
+        sha = hashlib.sha1()
+        parts = [request.endpoint, request.method, request.script_root + request.path, token]
+        parts.extend(request.headers.get(header) for header in self.headers)
+        for part in parts:
+            sha.update((part or '').encode('utf8'))
+            sha.update(b'|')
+        return 'restplus:idempotency:{0}'.format(sha.hexdigest())
+
+    def process(self, key, timeout, f, args, kwargs):
+        store = self.store or self.api.idempotency_store
+        fingerprint = hashlib.sha1(request.get_data(cache=True)).hexdigest()
+
+        entry = store.get(key)
+        if entry is None and store.add(key, (PENDING, fingerprint, None), timeout):
+            return self.run(store, key, fingerprint, f, args, kwargs)
+        entry = entry or store.get(key)
+
+        if entry is None:
+            abort(409, 'A request with the same idempotency key is being processed')
+        state, recorded_fingerprint, recorded = entry
+        if recorded_fingerprint != fingerprint:
+            abort(422, 'The idempotency key has already been used with another payload')
+        elif state == PENDING:
+            abort(409, 'A request with the same idempotency key is being processed')
+
+        response = load_response(recorded)
+        response.headers['Idempotent-Replayed'] = 'true'
+        return response
+
+    def run(self, store, key, fingerprint, f, args, kwargs):
+        resource = args[0] if args else None
+        try:
+            resp = f(*args, **kwargs)
+            if is_awaitable(resp):
+                resp = self.api.run_async(resp)
+            response = serialize_response(self.api, resource, negotiate(self.api, resource), resp)
+        except Exception:
+            store.delete(key)
+            raise
+        if response.status_code < 500 and not response.is_streamed:
+            ttl = self.ttl if self.ttl is not None else current_app.config.get('RESTPLUS_IDEMPOTENCY_TTL', 86400)
+            store.set(key, (DONE, fingerprint, dump_response(response)), ttl)
+        else:
+            store.delete(key)
+        return response
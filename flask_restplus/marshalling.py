@@ -3,13 +3,24 @@ from __future__ import unicode_literals
 
 from functools import wraps
 
-from flask import request, current_app, has_app_context
+from flask import request, current_app, has_app_context, has_request_context
+from six import text_type
 
-from ._compat import OrderedDict
+from ._compat import OrderedDict, aio, is_awaitable
+from .deferred import collect, collected
 from .mask import Mask, apply as apply_mask
 from .utils import unpack
 
 
+#: The request attribute flagging a response without body (ie. for ``HEAD`` requests)
+SKIP_BODY = '_restplus_skip_body'
+
+
+def skip_body():
+    '''Whether or not the current response body will be discarded'''
+    return has_request_context() and getattr(request, SKIP_BODY, False)
+
+
 def marshal(data, fields, envelope=None, mask=None):
     """Takes raw data (in the form of a dict, list, object) and a dict of
     fields to output and filters the data based on those fields.
@@ -31,29 +42,61 @@ def marshal(data, fields, envelope=None, mask=None):
     >>> marshal(data, mfields, envelope='data')
     OrderedDict([('data', OrderedDict([('a', 100)]))])
 
+    Fields values being awaitables or :class:`concurrent.futures.Future`
+    are collected across the whole output and resolved concurrently.
+
+    Models with a ``cache`` reuse the previous output of an object
+    for the same mask and object version key.
     """
 
+    with collect() as collection:
+        return collection.resolve(_marshal(data, fields, envelope, mask))
+
+
+def _marshal_async(data, fields, envelope=None, mask=None):
+    '''
+    Same as :func:`marshal` but resolve the deferred values on the event loop running in this thread.
+
+    :return: an awaitable of the output if some values are pending, the output otherwise
+    '''
+    with collect() as collection:
+        return collection.resolve_async(_marshal(data, fields, envelope, mask))
+
+
+def _marshal(data, fields, envelope=None, mask=None, cache=None):
     def make(cls):
         if isinstance(cls, type):
             return cls()
         return cls
 
-    mask = mask or getattr(fields, '__mask__', None)
-    fields = getattr(fields, 'resolved', fields)
-    if mask:
+    if cache is None and getattr(fields, '__cache__', None):
+        cache = fields, text_type(mask or '')
+
+    if hasattr(fields, 'projection'):
+        fields = fields.projection(mask)
+    elif mask:
         fields = apply_mask(fields, mask, skip=True)
 
     if isinstance(data, (list, tuple)):
-        out = [marshal(d, fields) for d in data]
+        out = [_marshal(d, fields, cache=cache) for d in data]
         if envelope:
             out = OrderedDict([(envelope, out)])
         return out
 
-    items = ((k, marshal(data, v) if isinstance(v, dict)
-              else make(v).output(k, data))
-             for k, v in fields.items())
-
-    out = OrderedDict(items)
+    key = cache[0].output_key(data) if cache is not None else None
+    if key is not None:
+        key = (cache[1], key)
+        out = cache[0].outputs.get(key)
+        if out is None:
+            count = collected()
+            out = _marshal_fields(data, fields, make)
+            if collected() == count:
+                # Outputs waiting for deferred values are not reusable
+                cache[0].outputs.set(key, _copy(out))
+        else:
+            out = _copy(out)
+    else:
+        out = _marshal_fields(data, fields, make)
 
     if envelope:
         out = OrderedDict([(envelope, out)])
@@ -61,6 +104,21 @@ def marshal(data, fields, envelope=None, mask=None):
     return out
 
 
+def _copy(out):
+    '''Copy an output tree (dicts and lists) so cached outputs are never shared with the callers'''
+    if isinstance(out, dict):
+        return type(out)((k, _copy(v)) for k, v in out.items())
+    elif isinstance(out, list):
+        return [_copy(v) for v in out]
+    return out
+
+
+def _marshal_fields(data, fields, make):
+    return OrderedDict((k, _marshal(data, v) if isinstance(v, dict)
+                        else make(v).output(k, data))
+                       for k, v in fields.items())
+
+
 class marshal_with(object):
     """A decorator that apply marshalling to the return values of your methods.
 
@@ -99,18 +157,46 @@ class marshal_with(object):
         @wraps(f)
         def wrapper(*args, **kwargs):
             resp = f(*args, **kwargs)
+            if skip_body():
+                return resp
+            fields = self.fields
             mask = self.mask
             if has_app_context():
                 mask_header = current_app.config['RESTPLUS_MASK_HEADER']
-                mask = request.headers.get(mask_header) or mask
-            if isinstance(resp, tuple):
-                data, code, headers = unpack(resp)
-                return marshal(data, self.fields, self.envelope, mask), code, headers
-            else:
-                return marshal(resp, self.fields, self.envelope, mask)
+                header_mask = request.headers.get(mask_header)
+                view = request_view()
+                if header_mask:
+                    mask = header_mask
+                elif view and getattr(fields, '__views__', None):
+                    fields, mask = fields.view(view), None
+
+            def output(resp, marshal=marshal):
+                if isinstance(resp, tuple):
+                    data, code, headers = unpack(resp)
+                    out = marshal(data, fields, self.envelope, mask)
+                    if is_awaitable(out):
+                        return aio.then(out, lambda out: (out, code, headers))
+                    return out, code, headers
+                else:
+                    return marshal(resp, fields, self.envelope, mask)
+
+            if is_awaitable(resp):
+                # Deferred values are resolved on the handler event loop
+                return aio.then(resp, lambda resp: output(resp, _marshal_async))
+            return output(resp)
         return wrapper
 
 
+def request_view():
+    '''Extract the requested model view name from the current request if any'''
+    view_header = current_app.config.get('RESTPLUS_VIEW_HEADER')
+    view_arg = current_app.config.get('RESTPLUS_VIEW_ARG')
+    view = request.headers.get(view_header) if view_header else None
+    if not view and view_arg:
+        view = request.args.get(view_arg)
+    return view
+
+
 class marshal_with_field(object):
     """
     A decorator that formats the return values of your methods with a single field.
@@ -138,10 +224,15 @@ class marshal_with_field(object):
         @wraps(f)
         def wrapper(*args, **kwargs):
             resp = f(*args, **kwargs)
+            if skip_body():
+                return resp
+
+            def output(resp):
+                if isinstance(resp, tuple):
+                    data, code, headers = unpack(resp)
+                    return self.field.format(data), code, headers
+                return self.field.format(resp)
 
-            if isinstance(resp, tuple):
-                data, code, headers = unpack(resp)
-                return self.field.format(data), code, headers
-            return self.field.format(resp)
+            return aio.then(resp, output) if is_awaitable(resp) else output(resp)
 
         return wrapper
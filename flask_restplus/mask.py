@@ -12,7 +12,12 @@ from .errors import RestError
 
 log = logging.getLogger(__name__)
 
-LEXER = re.compile(r'\{|\}|\,|[\w_:\-\*]+')
+LEXER = re.compile(r'\([^)]*\)|\{|\}|\,|[\w_:\-\*]+')
+
+#: Known mask field arguments and their parser
+ARGUMENTS = {
+    'limit': int,
+}
 
 
 class MaskError(RestError):
@@ -31,9 +36,11 @@ class Mask(OrderedDict):
 
     :param str|dict|Mask mask: A mask, parsed or not
     :param bool skip: If ``True``, missing fields won't appear in result
+    :param dict args: Optional field arguments (ie. ``{'limit': 5}``)
     '''
-    def __init__(self, mask=None, skip=False, **kwargs):
+    def __init__(self, mask=None, skip=False, args=None, **kwargs):
         self.skip = skip
+        self.args = args if args is not None else getattr(mask, 'args', None) or {}
         if isinstance(mask, six.text_type):
             super(Mask, self).__init__()
             self.parse(mask)
@@ -54,6 +61,14 @@ class Mask(OrderedDict):
 
             field,nested{nested_field,another},last
 
+        A field prefixed by a dash is excluded from the output::
+
+            {*,-history,author{-bio}}
+
+        A field can be followed by some arguments between parenthesis::
+
+            {children(limit:5){name}}
+
         All extras characters will be ignored.
 
         :param str mask: the mask string to parse
@@ -70,11 +85,18 @@ class Mask(OrderedDict):
 
         for token in LEXER.findall(mask):
             if token == '{':
-                if previous not in fields:
+                if previous not in fields or fields[previous] is False:
                     raise ParseError('Unexpected opening bracket')
-                fields[previous] = Mask(skip=self.skip)
+                if not isinstance(fields[previous], Mask):
+                    fields[previous] = Mask(skip=self.skip)
                 stack.append(fields)
                 fields = fields[previous]
+            elif token.startswith('('):
+                if previous not in fields or fields[previous] is not True:
+                    raise ParseError('Unexpected opening parenthesis')
+                fields[previous] = Mask(skip=self.skip, args=self.parse_args(token))
+                # Keep the field as previous token to allow nested brackets
+                continue
             elif token == '}':
                 if not stack:
                     raise ParseError('Unexpected closing bracket')
@@ -82,6 +104,11 @@ class Mask(OrderedDict):
             elif token == ',':
                 if previous in (',', '{', None):
                     raise ParseError('Unexpected coma')
+            elif token.startswith('-'):
+                token = token[1:]
+                if not token or token == '*':
+                    raise ParseError('Unexpected exclusion')
+                fields[token] = False
             else:
                 fields[token] = True
 
@@ -90,6 +117,27 @@ class Mask(OrderedDict):
         if stack:
             raise ParseError('Missing closing bracket')
 
+    def parse_args(self, token):
+        '''
+        Parse field arguments in the form ``(name:value,other:value)``
+
+        :param str token: the arguments token including the parenthesis
+        :raises ParseError: when an argument is unknown or invalid
+        '''
+        args = {}
+        for arg in token[1:-1].split(','):
+            name, _, value = arg.partition(':')
+            name = name.strip()
+            if name not in ARGUMENTS:
+                raise ParseError('Unknown argument: {0}'.format(name))
+            try:
+                args[name] = ARGUMENTS[name](value.strip())
+            except ValueError:
+                raise ParseError('Invalid value for argument {0}: {1}'.format(name, value))
+            if args[name] < 0:
+                raise ParseError('Invalid value for argument {0}: {1}'.format(name, value))
+        return args
+
     def clean(self, mask):
         '''Remove unecessary characters'''
         mask = mask.replace('\n', '').strip()
@@ -111,7 +159,12 @@ class Mask(OrderedDict):
         from . import fields
         # Should handle lists
         if isinstance(data, (list, tuple, set)):
-            return [self.apply(d) for d in data]
+            if self.args.get('limit') is not None:
+                data = list(data)[:self.args['limit']]
+            return [self.apply(d) for d in data] if self or not self.args else data
+        elif 'limit' in self.args and not is_list_field(data) and (
+                isinstance(data, fields.Raw) or isclass(data) and issubclass(data, fields.Raw)):
+            raise MaskError('Limit is only supported on lists')
         elif isinstance(data, (fields.Nested, fields.List, fields.Polymorph)):
             return data.clone(self)
         elif type(data) == fields.Raw:
@@ -121,6 +174,9 @@ class Mask(OrderedDict):
         elif isinstance(data, fields.Raw) or isclass(data) and issubclass(data, fields.Raw):
             # Not possible to apply a mask on these remaining fields types
             raise MaskError('Mask is inconsistent with model')
+        elif not self and self.args:
+            # Arguments only mask (ie. ``children(limit:5)``) does not filter
+            return data
         # Should handle objects
         elif (not isinstance(data, (dict, OrderedDict))
                 and hasattr(data, '__dict__')):
@@ -139,7 +195,7 @@ class Mask(OrderedDict):
         '''
         out = {}
         for field, content in self.items():
-            if field == '*':
+            if field == '*' or content is False:
                 continue
             elif isinstance(content, Mask):
                 nested = data.get(field, None)
@@ -154,18 +210,41 @@ class Mask(OrderedDict):
             else:
                 out[field] = data.get(field, None)
 
-        if '*' in self.keys():
+        if self.has_star:
             for key, value in data.items():
-                if key not in out:
+                if key not in out and self.get(key) is not False:
                     out[key] = value
         return out
 
+    @property
+    def has_star(self):
+        '''
+        Whether or not this mask select all remaining fields.
+
+        This is the case with an explicit star
+        or when the mask only holds exclusions.
+        '''
+        return '*' in self or bool(self) and all(v is False for v in self.values())
+
     def __str__(self):
         return '{{{0}}}'.format(','.join([
-            ''.join((k, str(v))) if isinstance(v, Mask) else k
+            ''.join((k, v.args_str(), str(v) if v else '')) if isinstance(v, Mask)
+            else '-' + k if v is False else k
             for k, v in self.items()
         ]))
 
+    def args_str(self):
+        '''Render the field arguments in mask syntax'''
+        if not self.args:
+            return ''
+        return '({0})'.format(','.join('{0}:{1}'.format(k, v) for k, v in sorted(self.args.items())))
+
+
+def is_list_field(field):
+    '''Whether or not a field marshals a list (ie. supports the ``limit`` argument)'''
+    from . import fields
+    return isinstance(field, fields.List) or isinstance(field, fields.Nested) and field.as_list
+
 
 def apply(data, mask, skip=False):
     '''
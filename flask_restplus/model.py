@@ -5,16 +5,17 @@ import copy
 import re
 
 from collections import MutableMapping
-from six import iteritems, itervalues
+from six import iteritems, itervalues, string_types, text_type
 from werkzeug import cached_property
 
-from .mask import Mask
+from ._compat import OrderedDict
+from .mask import Mask, MaskError, apply as apply_mask
 from .errors import abort
 
 from jsonschema import Draft4Validator
-from jsonschema.exceptions import ValidationError
 
-from .utils import not_none
+from .utils import not_none, LRUCache
+from .validation import CompiledValidator
 
 
 RE_REQUIRED = re.compile(r'u?\'(?P<name>.*)\' is a required property', re.I | re.U)
@@ -32,7 +33,21 @@ class Model(dict, MutableMapping):
 
     :param str name: The model public name
     :param str mask: an optional default model mask
+    :param dict views: optional named masks (ie. ``{'summary': '{id,name}'}``)
+    :param int|bool cache: Cache the marshalled outputs of objects by version (and mask).
+        Either the maximum number of outputs or ``True`` for ``outputs_size``.
+    :param str|callable cache_key: The attribute (or a function) giving an object version key.
+        Default to the object ``__cache_key__`` attribute.
     '''
+    #: The maximum number of cached masked projections by model
+    projections_size = 128
+
+    #: The default maximum number of cached marshalled outputs by model
+    outputs_size = 1024
+
+    #: Whether payload validators are compiled or generic jsonschema ones
+    compiled_validation = True
+
     def __init__(self, name, *args, **kwargs):
         self.__apidoc__ = {
             'name': name
@@ -42,6 +57,13 @@ class Model(dict, MutableMapping):
         self.__mask__ = kwargs.pop('mask', None)
         if self.__mask__ and not isinstance(self.__mask__, Mask):
             self.__mask__ = Mask(self.__mask__)
+        cache = kwargs.pop('cache', None)
+        self.__cache__ = self.outputs_size if cache is True else (cache or None)
+        self.cache_key = kwargs.pop('cache_key', None)
+        views = kwargs.pop('views', None) or {}
+        self.__views__ = OrderedDict(
+            (view, Mask(mask, skip=True)) for view, mask in sorted(iteritems(views))
+        )
         super(Model, self).__init__(*args, **kwargs)
 
     @cached_property
@@ -67,6 +89,74 @@ class Model(dict, MutableMapping):
 
         return resolved
 
+    @cached_property
+    def projections(self):
+        '''The masked fields projections cache'''
+        return LRUCache(self.projections_size)
+
+    def projection(self, mask=None):
+        '''
+        Get the resolved fields once masked.
+
+        The effective mask is the given one or the model default mask.
+        Each projection is computed once and cached.
+
+        :param str|Mask mask: An optional mask (parsed or not)
+        :raises MaskError: when unable to apply the mask
+        '''
+        mask = mask or self.__mask__
+        if not mask:
+            return self.resolved
+        key = mask if isinstance(mask, string_types) else text_type(mask)
+        fields = self.projections.get(key)
+        if fields is None:
+            fields = apply_mask(self.resolved, mask, skip=True)
+            self.projections.set(key, fields)
+        return fields
+
+    @cached_property
+    def outputs(self):
+        '''The marshalled outputs cache, by mask and object version key'''
+        return LRUCache(self.__cache__ or self.outputs_size)
+
+    def output_key(self, obj):
+        '''
+        Get the version key of an object for the marshalled outputs cache.
+
+        It should identify both the object and its version (ie. ``(id, updated_at)``).
+
+        :return: the key or ``None`` if the object output should not be cached
+        '''
+        cache_key = self.cache_key
+        if cache_key is None:
+            key = getattr(obj, '__cache_key__', None)
+        elif callable(cache_key):
+            key = cache_key(obj)
+        elif isinstance(obj, dict):
+            key = obj.get(cache_key)
+        else:
+            key = getattr(obj, cache_key, None)
+        return key() if callable(key) else key
+
+    @cached_property
+    def compiled_views(self):
+        '''
+        The fields projection for each named view, computed once.
+        '''
+        return dict((name, mask.apply(self.resolved)) for name, mask in iteritems(self.__views__))
+
+    def view(self, name):
+        '''
+        Get the precompiled fields for a named view
+
+        :param str name: the view name
+        :raises MaskError: when the view does not exist
+        '''
+        try:
+            return self.compiled_views[name]
+        except KeyError:
+            raise MaskError('Unknown view: {0}'.format(name))
+
     @property
     def ancestors(self):
         '''
@@ -142,13 +232,58 @@ class Model(dict, MutableMapping):
         model.__parent__ = self
         return model
 
+    @cached_property
+    def validators(self):
+        '''The JSON schema validators cache (by resolver)'''
+        return LRUCache(8)
+
+    def validator(self, resolver=None):
+        '''
+        Get the JSON schema validator for this model.
+
+        A single validator is built by resolver.
+        It is compiled from the model schema unless ``compiled_validation`` is ``False``.
+
+        :param RefResolver resolver: An optional JSON schema references resolver
+        '''
+        validator = self.validators.get(resolver)
+        if validator is None:
+            factory = CompiledValidator if self.compiled_validation else Draft4Validator
+            validator = factory(self.__schema__, resolver=resolver)
+            self.validators.set(resolver, validator)
+        return validator
+
     def validate(self, data, resolver=None):
-        validator = Draft4Validator(self.__schema__, resolver=resolver)
-        try:
-            validator.validate(data)
-        except ValidationError:
+        errors = list(self.validator(resolver).iter_errors(data))
+        if errors:
+            abort(400, message='Input payload validation failed',
+                  errors=dict(self.format_error(e) for e in errors))
+
+    def validate_list(self, data, resolver=None, max_errors=None):
+        '''
+        Validate a list of items against this model in a single pass.
+
+        Errors are keyed by item index.
+
+        :param list data: The items to validate
+        :param RefResolver resolver: An optional JSON schema references resolver
+        :param int max_errors: Stop validating once this number of errors is reached
+        '''
+        if not isinstance(data, list):
             abort(400, message='Input payload validation failed',
-                  errors=dict(self.format_error(e) for e in validator.iter_errors(data)))
+                  errors={'': '%r is not of type %r' % (data, 'array')})
+        validator = self.validator(resolver)
+        errors = {}
+        count = 0
+        for index, item in enumerate(data):
+            item_errors = list(validator.iter_errors(item))
+            if item_errors:
+                errors[index] = dict(self.format_error(e) for e in item_errors)
+                count += len(item_errors)
+                if max_errors and count >= max_errors:
+                    break
+        if errors:
+            abort(400, message='Input payload validation failed', errors=errors)
 
     def format_error(self, error):
         path = list(error.path)
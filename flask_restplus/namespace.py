@@ -32,3 +32,23 @@ class Namespace(object):
             self.add_resource(cls, *[self.path + url for url in urls], **kwargs)
             return cls
         return wrapper
+
+    def etag(self, version=None, weak=False):
+        '''A decorator handling conditional requests with entity tags (see :meth:`Api.etag`)'''
+        return self.api.etag(version, weak)
+
+    def cache(self, ttl=None, vary=None, backend=None):
+        '''A decorator caching the serialized responses (see :meth:`Api.cache`)'''
+        return self.api.cache(ttl, vary, backend)
+
+    def coalesce(self, timeout=None, vary=None):
+        '''A decorator coalescing concurrent identical requests (see :meth:`Api.coalesce`)'''
+        return self.api.coalesce(timeout, vary)
+
+    def cache_control(self, **kwargs):
+        '''A decorator declaring the HTTP caching headers of an operation (see :meth:`Api.cache_control`)'''
+        return self.api.cache_control(**kwargs)
+
+    def idempotent(self, func=None, **kwargs):
+        '''A decorator replaying responses by idempotency key (see :meth:`Api.idempotent`)'''
+        return self.api.idempotent(func, **kwargs)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from flask import current_app, request as current_request
+
+from .representations import get_backend
+
+
+__all__ = ('get_payload', )
+
+_MISSING = object()
+
+#: The request attribute holding the decoded payload
+CACHE_ATTRIBUTE = '_restplus_payload'
+
+
+def is_json(request):
+    '''Whether or not the request mimetype is JSON'''
+    mimetype = request.mimetype
+    return mimetype == 'application/json' or (mimetype.startswith('application/') and mimetype.endswith('+json'))
+
+
+def get_payload(request=None):
+    '''
+    Decode the request JSON payload once and share it for the whole request.
+
+    Payload validation, :attr:`Api.payload <flask_restplus.Api.payload>`
+    and the request parser all rely on it.
+    The decoder can be customized with the ``RESTPLUS_JSON_DECODER`` configuration:
+    a callable taking the body as text and returning the decoded payload.
+    Otherwise, the ``RESTPLUS_JSON_BACKEND`` one is used.
+
+    :param request: The request to decode (default to the current one)
+    :return: the decoded payload or ``None`` if the request is not JSON
+    :raises BadRequest: if the payload is not a valid JSON document
+    '''
+    request = request if request is not None else current_request
+    payload = getattr(request, CACHE_ATTRIBUTE, _MISSING)
+    if payload is _MISSING:
+        decoder = current_app.config.get('RESTPLUS_JSON_DECODER')
+        if decoder is None and current_app.config.get('RESTPLUS_JSON_BACKEND', 'json') != 'json':
+            decoder = get_backend().loads
+        if decoder is None:
+            payload = request.get_json()
+        elif not is_json(request):
+            payload = None
+        else:
+            data = request.get_data(cache=True)
+            try:
+                payload = decoder(data.decode(request.charset or 'utf-8'))
+            except ValueError as e:
+                payload = request.on_json_loading_failed(e)
+        setattr(request, CACHE_ATTRIBUTE, payload)
+    return payload
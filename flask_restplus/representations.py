@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import
+
+import json
+import logging
+
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask import make_response, current_app
+from six import PY3
+
+
+log = logging.getLogger(__name__)
+
+__all__ = ('output_json', 'get_backend', 'JsonBackend')
+
+#: Supported JSON backends, by order of preference for ``auto``
+BACKENDS = ('orjson', 'rapidjson', 'ujson', 'json')
+
+
+def default(obj):
+    '''Serialize types unsupported by the JSON backends'''
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    elif isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError('{0!r} is not JSON serializable'.format(obj))
+
+
+def default_for(settings):
+    '''
+    The ``default`` serializer of some :func:`json.dumps` settings.
+
+    A configured ``default`` or encoder class (``cls``) takes precedence over :func:`default`.
+    '''
+    if settings.get('default'):
+        return settings['default']
+    elif settings.get('cls'):
+        return settings['cls']().default
+    return default
+
+
+class JsonBackend(object):
+    '''
+    A JSON backend wrapping the standard library :mod:`json` module.
+
+    Subclasses wrap faster third-party modules with the same interface.
+
+    :param module: The wrapped JSON module
+    '''
+    name = 'json'
+
+    def __init__(self, module):
+        self.module = module
+
+    def dumps(self, data, **settings):
+        '''Serialize data into a JSON string, accepting :func:`json.dumps` settings'''
+        if not settings.get('default') and not settings.get('cls'):
+            # Never override a configured encoder
+            settings['default'] = default
+        return self.module.dumps(data, **settings)
+
+    def loads(self, text):
+        '''Deserialize a JSON string'''
+        return self.module.loads(text)
+
+
+class OrjsonBackend(JsonBackend):
+    name = 'orjson'
+
+    def dumps(self, data, **settings):
+        option = self.module.OPT_NON_STR_KEYS
+        if settings.get('indent'):
+            option |= self.module.OPT_INDENT_2
+        if settings.get('sort_keys'):
+            option |= self.module.OPT_SORT_KEYS
+        return self.module.dumps(data, default=default_for(settings), option=option).decode('utf8')
+
+
+class RapidjsonBackend(JsonBackend):
+    name = 'rapidjson'
+
+    def dumps(self, data, **settings):
+        return self.module.dumps(data, default=default_for(settings),
+                                 indent=settings.get('indent'), sort_keys=settings.get('sort_keys', False),
+                                 ensure_ascii=settings.get('ensure_ascii', True))
+
+
+class UjsonBackend(JsonBackend):
+    name = 'ujson'
+
+    def dumps(self, data, **settings):
+        return self.module.dumps(data, default=default_for(settings),
+                                 indent=settings.get('indent') or 0, sort_keys=settings.get('sort_keys', False),
+                                 ensure_ascii=settings.get('ensure_ascii', True))
+
+
+BACKEND_CLASSES = {
+    'json': JsonBackend,
+    'orjson': OrjsonBackend,
+    'rapidjson': RapidjsonBackend,
+    'ujson': UjsonBackend,
+}
+
+_backends = {}
+
+
+def load_backend(name):
+    if name == 'auto':
+        for candidate in BACKENDS:
+            backend = load_backend(candidate)
+            if backend:
+                return backend
+    elif name not in BACKEND_CLASSES:
+        raise ValueError('Unknown JSON backend {0!r}, expected one of: auto, {1}'.format(name, ', '.join(BACKENDS)))
+    try:
+        module = __import__(name)
+    except ImportError:
+        return None
+    return BACKEND_CLASSES[name](module)
+
+
+def get_backend(name=None):
+    '''
+    Get a JSON backend by name.
+
+    An unavailable backend falls back on the standard library :mod:`json` module.
+
+    :param str name: One of ``auto``, ``orjson``, ``rapidjson``, ``ujson`` or ``json``.
+        Default to the ``RESTPLUS_JSON_BACKEND`` configuration.
+    :rtype: JsonBackend
+    :raises ValueError: on unknown backend
+    '''
+    name = name or current_app.config.get('RESTPLUS_JSON_BACKEND') or 'json'
+    backend = _backends.get(name)
+    if backend is None:
+        backend = load_backend(name)
+        if backend is None:
+            log.warning('JSON backend %s is not installed, fallback on json', name)
+            backend = JsonBackend(json)
+        _backends[name] = backend
+    return backend
+
+
+def output_json(data, code, headers=None):
+    '''Makes a Flask response with a JSON encoded body using the configured backend'''
+
+    settings = current_app.config.get('RESTFUL_JSON', {})
+
+    # If we're in debug mode, and the indent is not set, we set it to a
+    # reasonable value here.  Note that this won't override any existing value
+    # that was set.  We also set the "sort_keys" value.
+    if current_app.debug:
+        settings.setdefault('indent', 4)
+        settings.setdefault('sort_keys', not PY3)
+
+    # always end the json dumps with a new line
+    # see https://github.com/mitsuhiko/flask/pull/1262
+    dumped = get_backend().dumps(data, **dict(settings)) + '\n'
+
+    resp = make_response(dumped, code)
+    resp.headers.extend(headers or {})
+    return resp
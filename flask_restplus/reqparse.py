@@ -5,7 +5,7 @@ import decimal
 import six
 
 from copy import deepcopy
-from flask import current_app, request
+from flask import current_app, request, Request
 
 from werkzeug.datastructures import MultiDict, FileStorage
 from werkzeug import exceptions
@@ -13,6 +13,7 @@ from werkzeug import exceptions
 from .errors import abort
 from .marshalling import marshal
 from .model import Model
+from .payload import get_payload
 
 
 class ParseResult(dict):
@@ -97,7 +98,7 @@ class Argument(object):
         :param request: The flask request object to parse arguments from
         '''
         if isinstance(self.location, six.string_types):
-            value = getattr(request, self.location, MultiDict())
+            value = self.read(request, self.location, MultiDict())
             if callable(value):
                 value = value()
             if value is not None:
@@ -105,7 +106,7 @@ class Argument(object):
         else:
             values = MultiDict()
             for l in self.location:
-                value = getattr(request, l, None)
+                value = self.read(request, l)
                 if callable(value):
                     value = value()
                 if value is not None:
@@ -114,6 +115,12 @@ class Argument(object):
 
         return MultiDict()
 
+    def read(self, request, location, default=None):
+        '''Read a location from the request, sharing the decoded JSON payload'''
+        if location == 'json' and isinstance(request, Request):
+            return get_payload(request)
+        return getattr(request, location, default)
+
     def convert(self, value, op):
         # Don't cast None
         if value is None:
@@ -294,7 +301,7 @@ class RequestParser(object):
         :rtype: ParseResult
         '''
         if req is None:
-            req = request
+            req = request._get_current_object()
 
         namespace = self.result_class()
 
@@ -1,11 +1,61 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from flask import request
+from collections import namedtuple
+from functools import partial
+
+from flask import request, current_app
 from flask.views import MethodView
+from werkzeug.exceptions import NotAcceptable
 from werkzeug.wrappers import Response
 
-from .utils import unpack
+from ._compat import is_awaitable
+from .caching import CACHE_CONTROL, CacheControl
+from .errors import SpecsError
+from .marshalling import SKIP_BODY
+from .payload import get_payload
+from .utils import unpack, best_match
+
+
+#: A precomputed HTTP method handler: the method name, its function
+#: (decorated if ``precompose_decorators`` is set), its payload validation
+#: and its caching headers policy
+Handler = namedtuple('Handler', ('name', 'func', 'model', 'as_list', 'cache'))
+
+
+def payload_validation(func):
+    '''
+    Extract the payload validation informations from a documented function.
+
+    :return: a ``(model, as_list)`` tuple or ``(None, False)`` if no validation is required
+    '''
+    apidoc = getattr(func, '__apidoc__', None) or {}
+    model = apidoc.get('body')
+    if not apidoc.get('validate', False):
+        return None, False
+    elif model and hasattr(model, 'validate'):
+        return model, False
+    elif isinstance(model, list) and hasattr(model[0], 'validate_list'):
+        return model[0], True
+    return None, False
+
+
+def cache_control(cls, method, func):
+    '''
+    Build the caching headers policy of a resource method from its documentation.
+
+    The ``cache`` settings can be given on the resource, on the method
+    (ie. with :meth:`~flask_restplus.Api.cache_control`) or both.
+
+    :return: a :class:`~flask_restplus.caching.CacheControl` or ``None``
+    '''
+    settings = {}
+    resource_doc = getattr(cls, '__apidoc__', None) or {}
+    method_doc = resource_doc.get(method) or {}
+    func_doc = getattr(func, '__apidoc__', None) or {}
+    for doc in resource_doc, method_doc, func_doc:
+        settings.update(doc.get('cache') or {})
+    return CacheControl(**settings) if settings else None
 
 
 class Resource(MethodView):
@@ -19,34 +69,130 @@ class Resource(MethodView):
     Otherwise the appropriate method is called and passed all arguments
     from the url rule used when adding the resource to an Api instance.
     See :meth:`~flask_restplus.Api.add_resource` for details.
+
+    The ``method_decorators`` are applied to the bound method on each request.
+    Resources setting ``precompose_decorators`` to ``True`` have them applied once per class,
+    on registration, to the unbound methods: the resource instance is then given as first argument.
+
+    Stateless resources can set ``singleton`` to ``True``
+    (or be registered with ``singleton=True``)
+    to serve all requests with a single instance built on registration.
     '''
 
     representations = None
     method_decorators = []
 
+    #: Whether or not the ``method_decorators`` are applied once to the unbound methods
+    precompose_decorators = False
+
+    #: Whether or not a single instance serves every request
+    singleton = False
+
     def __init__(self, api, *args, **kwargs):
         self.api = api
 
+    @classmethod
+    def as_view(cls, name, *class_args, **class_kwargs):
+        if not cls.singleton:
+            return super(Resource, cls).as_view(name, *class_args, **class_kwargs)
+
+        stateful = [klass for klass in cls.__mro__[:cls.__mro__.index(Resource)] if '__init__' in vars(klass)]
+        if stateful:
+            raise SpecsError('Singleton resource {0} should not define __init__ (in {1})'.format(
+                cls.__name__, ', '.join(klass.__name__ for klass in stateful)
+            ))
+
+        instance = cls(*class_args, **class_kwargs)
+
+        def view(*args, **kwargs):
+            return instance.dispatch_request(*args, **kwargs)
+
+        if cls.decorators:
+            view.__name__ = name
+            view.__module__ = cls.__module__
+            for decorator in cls.decorators:
+                view = decorator(view)
+
+        # Same attributes than views built by flask
+        view.view_class = cls
+        view.view_instance = instance
+        view.__name__ = name
+        view.__doc__ = cls.__doc__
+        view.__module__ = cls.__module__
+        view.methods = cls.methods
+        return view
+
+    @classmethod
+    def dispatch_table(cls):
+        '''
+        The per-class dispatch table mapping HTTP methods to their :class:`Handler`.
+
+        It is built on first access (or on registration) and then reused by each request.
+        '''
+        table = cls.__dict__.get('_dispatch_table')
+        if table is None:
+            table = {}
+            for method in cls.methods or []:
+                func = getattr(cls, method.lower(), None)
+                if func is None:
+                    continue
+                cache = cache_control(cls, method.lower(), func)
+                if cls.precompose_decorators:
+                    for decorator in cls.method_decorators:
+                        func = decorator(func)
+                model, as_list = payload_validation(func)
+                table[method] = Handler(method.lower(), func, model, as_list, cache)
+            if 'HEAD' not in table and 'GET' in table:
+                table['HEAD'] = table['GET']
+            cls._dispatch_table = table
+        return table
+
     def dispatch_request(self, *args, **kwargs):
-        # Taken from flask
-        meth = getattr(self, request.method.lower(), None)
-        if meth is None and request.method == 'HEAD':
-            meth = getattr(self, 'get', None)
-        assert meth is not None, 'Unimplemented method %r' % request.method
+        table = self.dispatch_table()
+        handler = table.get(request.method)
+        assert handler is not None, 'Unimplemented method %r' % request.method
+
+        if handler.cache is not None:
+            # Also applied on errors (if configured) by the API error handler
+            setattr(request, CACHE_CONTROL, handler.cache)
+
+        head = request.method == 'HEAD' and handler is table.get('GET') \
+            and not current_app.config.get('RESTPLUS_HEAD_CONTENT_LENGTH', False)
+
+        if self.precompose_decorators:
+            meth = partial(handler.func, self)
+        else:
+            meth = getattr(self, handler.name)
+            if self.method_decorators:
+                for decorator in self.method_decorators:
+                    meth = decorator(meth)
+                # Decorators may change the documented validation
+                model, as_list = payload_validation(meth)
+                handler = handler._replace(func=meth, model=model, as_list=as_list)
+
+        self.validate_payload(meth, handler)
+
+        if head:
+            # Body-less HEAD from GET: skip marshalling and serialization
+            setattr(request, SKIP_BODY, True)
 
-        for decorator in self.method_decorators:
-            meth = decorator(meth)
+        resp = meth(*args, **kwargs)
 
-        self.validate_payload(meth)
+        if is_awaitable(resp):
+            resp = self.api.run_async(resp)
 
-        resp = meth(*args, **kwargs)
+        if handler.cache is not None:
+            resp = handler.cache.apply(resp)
 
         if isinstance(resp, Response):  # There may be a better way to test
             return resp
 
+        if head:
+            return self.head_response(resp)
+
         representations = self.representations or {}
 
-        mediatype = request.accept_mimetypes.best_match(representations, default=None)
+        mediatype = best_match(request.headers.get('Accept'), representations)
         if mediatype in representations:
             data, code, headers = unpack(resp)
             resp = representations[mediatype](data, code, headers)
@@ -55,12 +201,43 @@ class Resource(MethodView):
 
         return resp
 
-    def validate_payload(self, func):
-        '''Perform a payload validation on expected model if necessary'''
-        if hasattr(func, '__apidoc__'):
-            model = func.__apidoc__.get('body')
-            validate = func.__apidoc__.get('validate', False)
-            if model and validate and hasattr(model, 'validate'):
-                # TODO: proper content negotiation
-                data = request.get_json()
-                model.validate(data, self.api.refresolver)
+    def head_response(self, resp):
+        '''
+        Build a body-less response for a HEAD request handled by ``get``.
+
+        Status and headers are preserved, the Content-Type is negotiated
+        but the body is neither marshalled nor serialized so no Content-Length is sent.
+        '''
+        data, code, headers = unpack(resp)
+        accept = request.headers.get('Accept')
+        mediatype = best_match(accept, self.representations or {})
+        if mediatype is None:
+            mediatype = best_match(accept, self.api.representations, default=self.api.default_mediatype)
+        if mediatype is None:
+            raise NotAcceptable()
+        response = Response(status=code, headers=headers, content_type=mediatype)
+        response.automatically_set_content_length = False
+        return response
+
+    def validate(self, handler):
+        '''Perform the precomputed payload validation of a handler'''
+        # TODO: proper content negotiation
+        data = get_payload()
+        if handler.as_list:
+            max_errors = current_app.config.get('RESTPLUS_MAX_VALIDATION_ERRORS')
+            handler.model.validate_list(data, self.api.refresolver, max_errors)
+        else:
+            handler.model.validate(data, self.api.refresolver)
+
+    def validate_payload(self, func, handler=None):
+        '''
+        Perform a payload validation on expected model if necessary
+
+        :param func: The handler method
+        :param Handler handler: The precomputed handler (computed from ``func`` if missing)
+        '''
+        if handler is None:
+            model, as_list = payload_validation(func)
+            handler = Handler(func.__name__, func, model, as_list, None)
+        if handler.model is not None:
+            self.validate(handler)
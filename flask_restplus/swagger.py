@@ -12,6 +12,7 @@ from flask import current_app
 from ._compat import OrderedDict
 
 from . import fields
+from .caching import CacheControl
 from .errors import SpecsError
 from .model import Model
 from .utils import merge, not_none, not_none_sorted
@@ -190,9 +191,7 @@ class Swagger(object):
         :returns: the full Swagger specification in a serializable format
         :rtype: dict
         '''
-        basepath = self.api.base_path
-        if len(basepath) > 1 and basepath.endswith('/'):
-            basepath = basepath[:-1]
+        basepath = self.base_path()
         infos = {
             'title': _v(self.api.title),
             'version': _v(self.api.version),
@@ -239,6 +238,13 @@ class Swagger(object):
         }
         return not_none(specs)
 
+    def base_path(self):
+        '''The API base path, the only part of the specifications depending on the request'''
+        basepath = self.api.base_path
+        if len(basepath) > 1 and basepath.endswith('/'):
+            basepath = basepath[:-1]
+        return basepath
+
     def get_host(self):
         hostname = current_app.config.get('SERVER_NAME', None) or None
         if hostname and self.api.blueprint and self.api.blueprint.subdomain:
@@ -359,6 +365,14 @@ class Swagger(object):
         # Handle deprecated annotation
         if doc.get('deprecated') or doc[method].get('deprecated'):
             operation['deprecated'] = True
+        # Handle responses cache
+        cache = doc.get('__cache__') or doc[method].get('__cache__')
+        if cache:
+            ttl = cache['ttl']
+            operation['x-cache'] = not_none({
+                'ttl': ttl if ttl is not None else current_app.config.get('RESTPLUS_RESPONSE_CACHE_TTL', 300),
+                'vary': cache['vary'],
+            })
         # Handle form exceptions:
         if operation['parameters'] and any(p['in'] == 'formData' for p in operation['parameters']):
             if any(p['type'] == 'file' for p in operation['parameters']):
@@ -418,15 +432,50 @@ class Swagger(object):
                 param['default'] = mask
             params.append(param)
 
+        # Handle model views
+        views = doc.get('__views__') or doc[method].get('__views__')
+        if views:
+            view_header = current_app.config.get('RESTPLUS_VIEW_HEADER')
+            view_arg = current_app.config.get('RESTPLUS_VIEW_ARG')
+            for name, location in ((view_header, 'header'), (view_arg, 'query')):
+                if name:
+                    params.append({
+                        'name': name,
+                        'in': location,
+                        'type': 'string',
+                        'enum': views,
+                        'description': 'An optional model view',
+                    })
+
+        # Handle idempotency keys
+        if doc.get('__idempotent__') or doc[method].get('__idempotent__'):
+            params.append({
+                'name': current_app.config.get('RESTPLUS_IDEMPOTENCY_HEADER', 'Idempotency-Key'),
+                'in': 'header',
+                'type': 'string',
+                'description': 'An optional unique key to safely retry the request',
+            })
+
+        # Handle entity tags
+        if doc.get('__etag__') or doc[method].get('__etag__'):
+            params.append({
+                'name': 'If-None-Match',
+                'in': 'header',
+                'type': 'string',
+                'description': 'An optional entity tag from a previous response',
+            })
+
         return params
 
     def responses_for(self, doc, method):
         # TODO: simplify/refactor responses/model handling
+        # Codes are strings (as in the serialized specifications) so they can be sorted
         responses = {}
 
         for d in doc, doc[method]:
             if 'responses' in d:
                 for code, response in iteritems(d['responses']):
+                    code = str(code)
                     description, model = (response, None) if isinstance(response, string_types) else response
                     description = description or DEFAULT_RESPONSE_DESCRIPTION
                     if code in responses:
@@ -447,11 +496,38 @@ class Swagger(object):
                         error_responses = getattr(handler, '__apidoc__', {}).get('responses', {})
                         code = list(error_responses.keys())[0] if error_responses else None
                         if code and exception.__name__ == name:
-                            responses[code] = {'$ref': '#/responses/{0}'.format(name)}
+                            responses[str(code)] = {'$ref': '#/responses/{0}'.format(name)}
                             break
 
         if not responses:
             responses['200'] = DEFAULT_RESPONSE.copy()
+
+        if doc.get('__etag__') or doc[method].get('__etag__'):
+            for code, response in iteritems(responses):
+                if str(code).startswith('2') and '$ref' not in response:
+                    response.setdefault('headers', {})['ETag'] = {
+                        'type': 'string',
+                        'description': 'The response entity tag',
+                    }
+            responses['304'] = {'description': 'Not Modified'}
+
+        if doc.get('__idempotent__') or doc[method].get('__idempotent__'):
+            responses.setdefault('409', {
+                'description': 'A request with the same idempotency key is being processed',
+            })
+            responses.setdefault('422', {
+                'description': 'The idempotency key has already been used with another payload',
+            })
+
+        # Handle caching headers
+        settings = merge(doc.get('cache') or {}, doc[method].get('cache') or {})
+        if settings:
+            cache_control = CacheControl(**settings)
+            headers = cache_control.headers_schema()
+            for code, response in iteritems(responses):
+                if '$ref' in response or not cache_control.applies(int(code) if code.isdigit() else 200):
+                    continue
+                response.setdefault('headers', {}).update(headers)
         return responses
 
     def serialize_definitions(self):
@@ -5,6 +5,10 @@ import re
 
 from copy import deepcopy
 from six import iteritems
+from threading import Lock
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
 
 from ._compat import OrderedDict
 
@@ -12,7 +16,8 @@ FIRST_CAP_RE = re.compile('(.)([A-Z][a-z]+)')
 ALL_CAP_RE = re.compile('([a-z0-9])([A-Z])')
 
 
-__all__ = ('merge', 'camel_to_dash', 'default_id', 'not_none', 'not_none_sorted', 'unpack')
+__all__ = ('merge', 'camel_to_dash', 'default_id', 'not_none', 'not_none_sorted', 'unpack', 'LRUCache',
+           'best_match')
 
 
 def merge(first, second):
@@ -114,3 +119,80 @@ def unpack(response, default_code=200):
         return data, code or default_code, headers
     else:
         raise ValueError('Too many response values')
+
+
+class LRUCache(object):
+    '''
+    A thread-safe bounded mapping evicting the least recently used entries.
+
+    :param int size: The maximum number of entries
+    '''
+    def __init__(self, size=128):
+        self.size = size
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        '''Get a value by its key and mark it as the most recently used'''
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        '''Store a value, evicting the least recently used entry if necessary'''
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        '''Remove a value by its key'''
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        '''Remove all entries'''
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __reduce__(self):
+        # Copies and pickles start empty
+        return self.__class__, (self.size, )
+
+
+#: Negotiated mediatypes by ``(Accept header, supported mediatypes, default)``
+NEGOTIATIONS = LRUCache(256)
+
+_MISSING = object()
+
+
+def best_match(accept, mediatypes, default=None):
+    '''
+    Negotiate the best supported mediatype for a raw ``Accept`` header.
+
+    Clients usually send a handful of distinct headers
+    so results are cached instead of parsing and sorting the header on each request.
+
+    :param str accept: The raw ``Accept`` header value (may be ``None``)
+    :param mediatypes: The supported mediatypes, by order of preference
+    :param str default: The mediatype to return if none matches
+    :return: the negotiated mediatype or ``default``
+    '''
+    mediatypes = tuple(mediatypes)
+    key = (accept, mediatypes, default)
+    mediatype = NEGOTIATIONS.get(key, _MISSING)
+    if mediatype is _MISSING:
+        mediatype = parse_accept_header(accept, MIMEAccept).best_match(mediatypes, default=default)
+        NEGOTIATIONS.set(key, mediatype)
+    return mediatype
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import numbers
+import re
+
+from collections import Mapping
+from six import iteritems, integer_types, string_types
+
+from jsonschema import Draft4Validator, RefResolver
+from jsonschema.exceptions import ValidationError
+
+
+__all__ = ('CompiledValidator', 'Definitions', 'SchemaCompiler')
+
+
+#: JSON schema types checkers (Draft 4 semantics: booleans are not numbers)
+TYPES = {
+    'array': lambda v: isinstance(v, list),
+    'boolean': lambda v: isinstance(v, bool),
+    'integer': lambda v: isinstance(v, integer_types) and not isinstance(v, bool),
+    'null': lambda v: v is None,
+    'number': lambda v: isinstance(v, numbers.Number) and not isinstance(v, bool),
+    'object': lambda v: isinstance(v, dict),
+    'string': lambda v: isinstance(v, string_types),
+}
+
+is_array = TYPES['array']
+is_number = TYPES['number']
+is_object = TYPES['object']
+is_string = TYPES['string']
+
+
+def unbool(value):
+    '''Distinguish booleans from 0 and 1 for uniqueness checks'''
+    if value is True:
+        return object
+    elif value is False:
+        return None
+    return value
+
+
+def is_unique(container):
+    seen = []
+    for item in container:
+        item = unbool(item)
+        if item in seen:
+            return False
+        seen.append(item)
+    return True
+
+
+class SchemaCompiler(object):
+    '''
+    Compile a JSON schema into specialised validation functions.
+
+    Each compiled node is a function ``(instance, path, errors)``
+    appending :class:`~jsonschema.exceptions.ValidationError` to ``errors``
+    in the same order and with the same messages than :class:`~jsonschema.Draft4Validator`.
+    Nodes using unsupported keywords fallback on :class:`~jsonschema.Draft4Validator`.
+
+    :param RefResolver resolver: The JSON schema references resolver
+    '''
+    #: Draft 4 keywords handled by the compiler
+    KEYWORDS = (
+        '$ref', 'allOf', 'enum', 'format', 'items', 'maxItems', 'maxLength', 'maximum',
+        'minItems', 'minLength', 'minimum', 'multipleOf', 'pattern', 'properties',
+        'required', 'type', 'uniqueItems',
+    )
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+        self.refs = {}
+
+    def compile(self, schema):
+        '''
+        Compile a schema node.
+
+        :param dict schema: the JSON schema node
+        :return: the validation function
+        '''
+        if '$ref' in schema:
+            # Draft 4 ignores all other keywords
+            return self.compile_ref(schema['$ref'])
+
+        if not self.is_supported(schema):
+            return self.compile_fallback(schema)
+
+        checks = []
+        for keyword, value in iteritems(schema):
+            if keyword in self.KEYWORDS and keyword != 'format':
+                compiler = getattr(self, 'compile_{0}'.format(keyword))
+                checks.append(compiler(value, schema))
+
+        if not checks:
+            return noop
+        elif len(checks) == 1:
+            return checks[0]
+
+        def validate(instance, path, errors):
+            for check in checks:
+                check(instance, path, errors)
+        return validate
+
+    def is_supported(self, schema):
+        for keyword, value in iteritems(schema):
+            if keyword in Draft4Validator.VALIDATORS and keyword not in self.KEYWORDS:
+                return False
+            elif keyword == 'type':
+                types = value if isinstance(value, list) else [value]
+                if any(t not in TYPES for t in types):
+                    return False
+        return True
+
+    def compile_fallback(self, schema):
+        validator = Draft4Validator(schema, resolver=self.resolver)
+
+        def validate(instance, path, errors):
+            for error in validator.iter_errors(instance):
+                error.path.extendleft(reversed(path))
+                errors.append(error)
+        return validate
+
+    def compile_ref(self, ref):
+        try:
+            url, schema = self.resolver.resolve(ref)
+        except Exception:
+            # Let jsonschema raise the resolution error on validation
+            return self.compile_fallback({'$ref': ref})
+
+        refs = self.refs
+        if url not in refs:
+            # Register before compiling to handle recursive references
+            refs[url] = None
+            refs[url] = self.compile(schema)
+
+        def validate(instance, path, errors):
+            refs[url](instance, path, errors)
+        return validate
+
+    def compile_allOf(self, subschemas, schema):
+        validators = [self.compile(subschema) for subschema in subschemas]
+
+        def validate(instance, path, errors):
+            for validator in validators:
+                validator(instance, path, errors)
+        return validate
+
+    def compile_properties(self, properties, schema):
+        validators = [(name, self.compile(subschema)) for name, subschema in iteritems(properties)]
+
+        def validate(instance, path, errors):
+            if not is_object(instance):
+                return
+            for name, validator in validators:
+                if name in instance:
+                    validator(instance[name], path + (name, ), errors)
+        return validate
+
+    def compile_required(self, required, schema):
+        def validate(instance, path, errors):
+            if not is_object(instance):
+                return
+            for name in required:
+                if name not in instance:
+                    errors.append(error('%r is a required property' % name,
+                                        'required', required, instance, schema, path))
+        return validate
+
+    def compile_type(self, types, schema):
+        types = types if isinstance(types, list) else [types]
+        checkers = [TYPES[t] for t in types]
+        reprs = ', '.join(repr(t) for t in types)
+
+        def validate(instance, path, errors):
+            if not any(check(instance) for check in checkers):
+                errors.append(error('%r is not of type %s' % (instance, reprs),
+                                    'type', types, instance, schema, path))
+        return validate
+
+    def compile_enum(self, enums, schema):
+        def validate(instance, path, errors):
+            if instance not in enums:
+                errors.append(error('%r is not one of %r' % (instance, enums),
+                                    'enum', enums, instance, schema, path))
+        return validate
+
+    def compile_minimum(self, minimum, schema):
+        exclusive = schema.get('exclusiveMinimum', False)
+        cmp = 'less than or equal to' if exclusive else 'less than'
+
+        def validate(instance, path, errors):
+            if not is_number(instance):
+                return
+            if instance <= minimum if exclusive else instance < minimum:
+                errors.append(error('%r is %s the minimum of %r' % (instance, cmp, minimum),
+                                    'minimum', minimum, instance, schema, path))
+        return validate
+
+    def compile_maximum(self, maximum, schema):
+        exclusive = schema.get('exclusiveMaximum', False)
+        cmp = 'greater than or equal to' if exclusive else 'greater than'
+
+        def validate(instance, path, errors):
+            if not is_number(instance):
+                return
+            if instance >= maximum if exclusive else instance > maximum:
+                errors.append(error('%r is %s the maximum of %r' % (instance, cmp, maximum),
+                                    'maximum', maximum, instance, schema, path))
+        return validate
+
+    def compile_multipleOf(self, multiple, schema):
+        def validate(instance, path, errors):
+            if not is_number(instance):
+                return
+            if isinstance(multiple, float):
+                quotient = instance / multiple
+                failed = int(quotient) != quotient
+            else:
+                failed = instance % multiple
+            if failed:
+                errors.append(error('%r is not a multiple of %r' % (instance, multiple),
+                                    'multipleOf', multiple, instance, schema, path))
+        return validate
+
+    def compile_minLength(self, length, schema):
+        def validate(instance, path, errors):
+            if is_string(instance) and len(instance) < length:
+                errors.append(error('%r is too short' % (instance, ),
+                                    'minLength', length, instance, schema, path))
+        return validate
+
+    def compile_maxLength(self, length, schema):
+        def validate(instance, path, errors):
+            if is_string(instance) and len(instance) > length:
+                errors.append(error('%r is too long' % (instance, ),
+                                    'maxLength', length, instance, schema, path))
+        return validate
+
+    def compile_pattern(self, pattern, schema):
+        regex = re.compile(pattern)
+
+        def validate(instance, path, errors):
+            if is_string(instance) and not regex.search(instance):
+                errors.append(error('%r does not match %r' % (instance, pattern),
+                                    'pattern', pattern, instance, schema, path))
+        return validate
+
+    def compile_items(self, items, schema):
+        if isinstance(items, dict):
+            validator = self.compile(items)
+
+            def validate(instance, path, errors):
+                if not is_array(instance):
+                    return
+                for index, item in enumerate(instance):
+                    validator(item, path + (index, ), errors)
+        else:
+            validators = [self.compile(item) for item in items]
+
+            def validate(instance, path, errors):
+                if not is_array(instance):
+                    return
+                for index, (item, validator) in enumerate(zip(instance, validators)):
+                    validator(item, path + (index, ), errors)
+        return validate
+
+    def compile_minItems(self, size, schema):
+        def validate(instance, path, errors):
+            if is_array(instance) and len(instance) < size:
+                errors.append(error('%r is too short' % (instance, ),
+                                    'minItems', size, instance, schema, path))
+        return validate
+
+    def compile_maxItems(self, size, schema):
+        def validate(instance, path, errors):
+            if is_array(instance) and len(instance) > size:
+                errors.append(error('%r is too long' % (instance, ),
+                                    'maxItems', size, instance, schema, path))
+        return validate
+
+    def compile_uniqueItems(self, unique, schema):
+        def validate(instance, path, errors):
+            if unique and is_array(instance) and not is_unique(instance):
+                errors.append(error('%r has non-unique elements' % (instance, ),
+                                    'uniqueItems', unique, instance, schema, path))
+        return validate
+
+
+def noop(instance, path, errors):
+    pass
+
+
+def error(message, validator, value, instance, schema, path):
+    return ValidationError(message, validator=validator, path=path,
+                           validator_value=value, instance=instance, schema=schema)
+
+
+class CompiledValidator(object):
+    '''
+    A JSON schema validator compiled into specialised Python functions.
+
+    It exposes the same ``iter_errors``/``is_valid`` interface than :class:`~jsonschema.Draft4Validator`.
+
+    :param dict schema: The JSON schema to validate against
+    :param RefResolver resolver: An optional JSON schema references resolver
+    '''
+    def __init__(self, schema, resolver=None):
+        self.schema = schema
+        self.resolver = resolver or RefResolver.from_schema(schema)
+        self._validate = SchemaCompiler(self.resolver).compile(schema)
+
+    def iter_errors(self, instance):
+        '''Iterate over all validation errors of an instance'''
+        errors = []
+        self._validate(instance, (), errors)
+        return iter(errors)
+
+    def is_valid(self, instance):
+        '''Whether or not an instance is valid'''
+        return next(self.iter_errors(instance), None) is None
+
+
+class Definitions(Mapping):
+    '''
+    A lazy read-only view on registered models JSON schemas.
+
+    It allows resolving ``#/definitions/{name}`` references
+    without building the whole Swagger specifications.
+
+    :param dict models: The registered models by name
+    '''
+    def __init__(self, models):
+        self.models = models
+
+    def __getitem__(self, name):
+        return self.models[name].__schema__
+
+    def __iter__(self):
+        return iter(self.models)
+
+    def __len__(self):
+        return len(self.models)
+
+    def resolver(self):
+        '''Build a JSON schema references resolver on these definitions'''
+        return RefResolver.from_schema({'definitions': self})
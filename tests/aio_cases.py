@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+'''Asynchronous handlers test cases (Python 3.5+ syntax, imported by test_aio)'''
+from __future__ import unicode_literals
+
+import asyncio
+import json
+import threading
+
+import flask_restplus as restplus
+
+from flask import request
+
+from . import TestCase, Mock, patch
+
+
+class AsyncResourceTest(TestCase):
+    def test_async_handler(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/<int:id>')
+        class Test(restplus.Resource):
+            async def get(self, id):
+                await asyncio.sleep(0)
+                return {'id': id, 'path': request.path}
+
+        with self.app.test_client() as client:
+            response = client.get('/test/42')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'id': 42, 'path': '/test/42'})
+
+    def test_async_handler_marshal_with(self):
+        api = restplus.Api(self.app)
+        person = api.model('Person', {
+            'name': restplus.fields.String,
+            'age': restplus.fields.Integer,
+        })
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.marshal_with(person)
+            async def get(self):
+                await asyncio.sleep(0)
+                return {'name': 'John', 'age': 42, 'password': 'secret'}, 201, {'X-Test': 'value'}
+
+        with self.app.test_client() as client:
+            response = client.get('/test/', headers={'X-Fields': 'name'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.headers['X-Test'], 'value')
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'name': 'John'})
+
+    def test_async_handler_marshal_tasks(self):
+        api = restplus.Api(self.app)
+        person = api.model('Person', {
+            'name': restplus.fields.String,
+            'age': restplus.fields.Integer,
+        })
+        loops = []
+
+        async def fetch(value):
+            loops.append(asyncio.get_event_loop())
+            await asyncio.sleep(0)
+            return value
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.marshal_with(person)
+            async def get(self):
+                loops.append(asyncio.get_event_loop())
+                return [
+                    {'name': asyncio.ensure_future(fetch('John')), 'age': asyncio.ensure_future(fetch(42))},
+                    {'name': 'Jane', 'age': fetch(24)},
+                ], 201
+
+        with self.app.test_client() as client:
+            response = client.get('/test/')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data.decode('utf8')), [
+            {'name': 'John', 'age': 42},
+            {'name': 'Jane', 'age': 24},
+        ])
+        self.assertEqual(len(loops), 4)
+        # Everything runs on the handler event loop
+        self.assertEqual(len(set(loops)), 1)
+
+    def test_async_handler_validation_and_errors(self):
+        api = restplus.Api(self.app, validate=True)
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+        })
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.expect(person)
+            async def post(self):
+                await asyncio.sleep(0)
+                if api.payload['name'] == 'forbidden':
+                    api.abort(403, 'Forbidden name')
+                return api.payload
+
+        with self.app.test_client() as client:
+            response = client.post('/test/', data='{}', headers={'content-type': 'application/json'})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('name', json.loads(response.data.decode('utf8'))['errors'])
+
+            response = client.post('/test/', data='{"name": "forbidden"}', headers={'content-type': 'application/json'})
+            self.assertEqual(response.status_code, 403)
+            self.assertEqual(json.loads(response.data.decode('utf8'))['message'], 'Forbidden name')
+
+            response = client.post('/test/', data='{"name": "John"}', headers={'content-type': 'application/json'})
+            self.assertEqual(response.status_code, 200)
+
+    def test_one_loop_per_thread(self):
+        api = restplus.Api(self.app)
+
+        async def current_loop():
+            return asyncio.get_event_loop()
+
+        loop = api.run_async(current_loop())
+        self.assertIs(api.run_async(current_loop()), loop)
+
+        loops = []
+        thread = threading.Thread(target=lambda: loops.append(api.run_async(current_loop())))
+        thread.start()
+        thread.join()
+        self.assertIsNot(loops[0], loop)
+
+
+class DeferredAwaitablesTest(TestCase):
+    def test_marshal_awaitables_concurrently(self):
+        from flask_restplus import marshal
+
+        size = 5
+        started = []
+
+        async def count(value):
+            # Only completes if all coroutines run concurrently
+            started.append(value)
+            while len(started) < size:
+                await asyncio.sleep(0.001)
+            return value
+
+        model = {
+            'name': restplus.fields.String,
+            'count': restplus.fields.Integer,
+        }
+        data = [{'name': str(i), 'count': count(i)} for i in range(size)]
+
+        async def marshal_later():
+            return marshal(data, model)
+
+        output = asyncio.new_event_loop().run_until_complete(asyncio.wait_for(marshal_later(), 5))
+        self.assertEqual(output, [{'name': str(i), 'count': i} for i in range(size)])
+
+    def test_awaitables_errors(self):
+        from flask_restplus import marshal
+
+        async def fail():
+            raise ValueError('Upstream failure')
+
+        with self.assertRaises(restplus.fields.MarshallingError):
+            marshal({'count': fail()}, {'count': restplus.fields.Integer})
+
+    def test_awaitables_in_calling_thread(self):
+        from flask_restplus import marshal
+
+        threads = []
+
+        async def path():
+            threads.append(threading.current_thread())
+            await asyncio.sleep(0)
+            return request.path
+
+        self.app.config['RESTPLUS_MARSHAL_EXECUTOR'] = executor = Mock()
+        with self.app.test_request_context('/test/'):
+            self.assertEqual(marshal({'path': path()}, {'path': restplus.fields.String}), {'path': '/test/'})
+        self.assertEqual(threads, [threading.current_thread()])
+        self.assertFalse(executor.submit.called)
+
+    def test_executor_configuration(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from flask_restplus import marshal
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.app.config['RESTPLUS_MARSHAL_EXECUTOR'] = executor
+
+        async def value():
+            return 42
+
+        async def marshal_in_loop():
+            # The running loop can't be blocked on: the executor is used
+            return marshal({'count': value()}, {'count': restplus.fields.Integer})
+
+        with self.context():
+            with patch.object(executor, 'submit', wraps=executor.submit) as submit:
+                loop = asyncio.new_event_loop()
+                try:
+                    self.assertEqual(loop.run_until_complete(marshal_in_loop()), {'count': 42})
+                finally:
+                    loop.close()
+                self.assertTrue(submit.called)
+        executor.shutdown()
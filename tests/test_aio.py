@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import sys
+
+if sys.version_info >= (3, 5):
+    from .aio_cases import AsyncResourceTest, DeferredAwaitablesTest  # noqa
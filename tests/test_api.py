@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import json
+
 from flask import url_for, Blueprint
 
 import flask_restplus as restplus
 
-from . import TestCase
+from . import TestCase, patch
 
 
 class APITestCase(TestCase):
@@ -249,3 +251,123 @@ class APITestCase(TestCase):
         with self.context():
             self.assertEqual(url_for('api.ns_test_resource'), '/api/ns/test/')
             self.assertEqual(url_for('api.ns_test_resource_2'), '/api/ns/test2/')
+
+    def test_freeze(self):
+        api = restplus.Api(self.app)
+
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+        }, views={'summary': '{name}'})
+
+        @api.route('/test/')
+        class TestResource(restplus.Resource):
+            @api.expect(person)
+            def post(self):
+                '''Create a person'''
+                pass
+
+        api.freeze()
+
+        self.assertTrue(api.frozen)
+        self.assertIn('resolved', person.__dict__)
+        self.assertIn('__schema__', person.__dict__)
+        self.assertIn('compiled_views', person.__dict__)
+        self.assertIn(api.refresolver, person.validators)
+        self.assertIsNotNone(api._specs)
+
+        with self.assertRaises(restplus.SpecsError):
+            api.model('Other', {})
+
+        with self.assertRaises(restplus.SpecsError):
+            api.add_resource(TestResource, '/other/')
+
+    def test_freeze_keep_request_base_path(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class TestResource(restplus.Resource):
+            def get(self):
+                pass
+
+        api.freeze()
+
+        with self.app.test_client() as client:
+            response = client.get('/swagger.json', base_url='http://localhost/prefix')
+        self.assertEqual(json.loads(response.data.decode('utf8'))['basePath'], '/prefix')
+        self.assertIn('/test/', api.__schema__['paths'])
+
+    def test_freeze_report_errors(self):
+        api = restplus.Api(self.app)
+
+        unregistered = restplus.Model('Unregistered', {})
+
+        @api.route('/test/')
+        class TestResource(restplus.Resource):
+            @api.expect(unregistered)
+            def post(self):
+                pass
+
+        with self.assertRaises(ValueError):
+            api.freeze()
+        self.assertFalse(api.frozen)
+
+    def test_freeze_with_gc_freeze(self):
+        api = restplus.Api(self.app)
+
+        with patch('flask_restplus.api.gc') as gc:
+            api.freeze(gc_freeze=True)
+            gc.freeze.assert_called_once_with()
+
+    def test_eager_config(self):
+        self.app.config['RESTPLUS_EAGER'] = True
+        blueprint = Blueprint('api', __name__, url_prefix='/api')
+        api = restplus.Api(blueprint)
+
+        @api.route('/test/')
+        class TestResource(restplus.Resource):
+            def get(self):
+                pass
+
+        self.assertFalse(api.frozen)
+        self.app.register_blueprint(blueprint)
+        self.assertTrue(api.frozen)
+        with self.app.test_request_context():
+            self.assertEqual(api.__schema__['basePath'], '/api')
+
+    def test_eager_config_with_app(self):
+        self.app.config['RESTPLUS_EAGER'] = True
+        api = restplus.Api(self.app)
+        self.assertFalse(api.frozen)
+
+        api.model('Person', {'name': restplus.fields.String})
+
+        @api.route('/test/')
+        class TestResource(restplus.Resource):
+            def get(self):
+                return {}
+
+        self.assertFalse(api.frozen)
+        with self.app.test_client() as client:
+            self.assertEqual(client.get('/test/').status_code, 200)
+        self.assertTrue(api.frozen)
+        self.assertIn('Person', api.models)
+
+    def test_gc_freeze_config(self):
+        self.app.config['RESTPLUS_GC_FREEZE'] = True
+        api = restplus.Api(self.app)
+
+        with patch('flask_restplus.api.gc') as gc:
+            api.freeze()
+            gc.freeze.assert_called_once_with()
+
+    def test_eager_config_lazy(self):
+        self.app.config['RESTPLUS_EAGER'] = True
+        api = restplus.Api()
+
+        @api.route('/test/')
+        class TestResource(restplus.Resource):
+            def get(self):
+                pass
+
+        api.init_app(self.app)
+        self.assertTrue(api.frozen)
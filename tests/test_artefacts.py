@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+import os
+import shutil
+import tempfile
+
+from flask import Flask
+
+import flask_restplus as restplus
+
+from flask_restplus import artefacts
+
+from . import TestCase, patch
+
+
+def build_api(app, description='A person'):
+    api = restplus.Api(app)
+
+    person = api.model('Person', {
+        'name': restplus.fields.String(required=True, description=description),
+        'age': restplus.fields.Integer(default=lambda: 42),
+    })
+
+    @api.route('/persons/')
+    class Persons(restplus.Resource):
+        @api.marshal_list_with(person)
+        def get(self):
+            '''List persons'''
+            pass
+
+    return api
+
+
+class ArtefactsTest(TestCase):
+    def setUp(self):
+        super(ArtefactsTest, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'api.cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_hash_is_stable(self):
+        api = build_api(self.app)
+        other_app = Flask(__name__)
+        other_api = build_api(other_app)
+        self.assertEqual(artefacts.definition_hash(api, self.app),
+                         artefacts.definition_hash(other_api, other_app))
+
+    def test_hash_change_with_definition(self):
+        api = build_api(self.app)
+        other_app = Flask(__name__)
+        other_api = build_api(other_app, description='Another description')
+        self.assertNotEqual(artefacts.definition_hash(api, self.app),
+                            artefacts.definition_hash(other_api, other_app))
+
+    def test_hash_change_with_config(self):
+        api = build_api(self.app)
+        key = artefacts.definition_hash(api, self.app)
+        self.app.config['RESTPLUS_MASK_HEADER'] = 'X-Mask'
+        self.assertNotEqual(artefacts.definition_hash(api, self.app), key)
+
+    def test_freeze_write_then_load_cache(self):
+        api = build_api(self.app)
+        api.freeze(cache_file=self.filename)
+        self.assertTrue(os.path.exists(self.filename))
+        with self.app.test_request_context():
+            specs = api.__schema__
+
+        other_app = Flask(__name__)
+        other_api = build_api(other_app)
+        with patch('flask_restplus.api.Swagger') as Swagger:
+            other_api.freeze(cache_file=self.filename)
+            self.assertFalse(Swagger.called)
+        with other_app.test_request_context():
+            self.assertEqual(other_api.__schema__, specs)
+        person = other_api.models['Person']
+        self.assertEqual(person.__schema__, api.models['Person'].__schema__)
+        # Models are resolved lazily on cache hit
+        self.assertNotIn('resolved', person.__dict__)
+        self.assertIn(other_api.refresolver, person.validators)
+
+    def test_freeze_rebuild_outdated_cache(self):
+        self.app.config['RESTPLUS_CACHE_FILE'] = self.filename
+        build_api(self.app).freeze()
+
+        other_app = Flask(__name__)
+        other_app.config['RESTPLUS_CACHE_FILE'] = self.filename
+        other_api = build_api(other_app, description='Changed')
+        other_api.freeze()
+
+        schema = other_api.models['Person'].__schema__
+        self.assertEqual(schema['properties']['name']['description'], 'Changed')
+        cached = artefacts.load(self.filename, artefacts.definition_hash(other_api, other_app))
+        self.assertEqual(cached['schemas']['Person'], schema)
+
+    def test_cache_file_is_json(self):
+        api = build_api(self.app)
+        api.freeze(cache_file=self.filename)
+        with open(self.filename, 'rb') as f:
+            cached = json.loads(f.read().decode('utf8'))
+        self.assertEqual(cached['hash'], artefacts.definition_hash(api, self.app))
+        self.assertIn('Person', cached['schemas'])
+
+    def test_load_missing_or_corrupted(self):
+        self.assertIsNone(artefacts.load(self.filename, 'key'))
+        with open(self.filename, 'wb') as f:
+            f.write(b'not json')
+        self.assertIsNone(artefacts.load(self.filename, 'key'))
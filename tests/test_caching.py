@@ -0,0 +1,600 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from flask import request
+
+import flask_restplus as restplus
+
+from flask_restplus import fields
+from flask_restplus.caching import FileCache, MemoryCache, SharedMemoryCache, SqliteCache
+
+from . import TestCase
+
+
+class ETagTest(TestCase):
+    def get(self, url, **kwargs):
+        with self.app.test_client() as client:
+            return client.get(url, **kwargs)
+
+    def test_version_etag(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/<int:id>')
+        class Test(restplus.Resource):
+            @api.etag(lambda id: 'v1')
+            def get(self, id):
+                calls.append(id)
+                return {'id': id}
+
+        response = self.get('/test/42')
+        self.assertEqual(response.status_code, 200)
+        tag = response.headers['ETag']
+        self.assertTrue(tag.startswith('"'))
+
+        response = self.get('/test/42', headers={'If-None-Match': tag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], tag)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(calls, [42])
+
+        response = self.get('/test/42', headers={'If-None-Match': '"other"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calls, [42, 42])
+
+    def test_body_etag(self):
+        api = restplus.Api(self.app)
+        model = api.model('Test', {'name': fields.String, 'age': fields.Integer})
+        data = {'name': 'John', 'age': 42}
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.etag()
+            @api.marshal_with(model)
+            def get(self):
+                return data
+
+        response = self.get('/test/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data.decode('utf8')), data)
+        tag = response.headers['ETag']
+
+        response = self.get('/test/', headers={'If-None-Match': tag})
+        self.assertEqual(response.status_code, 304)
+
+        data['age'] = 43
+        response = self.get('/test/', headers={'If-None-Match': tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], tag)
+
+    def test_body_etag_on_head(self):
+        api = restplus.Api(self.app)
+        model = api.model('Test', {'name': fields.String})
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.etag()
+            @api.marshal_with(model)
+            def get(self):
+                return {'name': 'John'}
+
+        with self.app.test_client() as client:
+            tag = client.get('/test/').headers['ETag']
+            response = client.head('/test/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['ETag'], tag)
+            response = client.head('/test/', headers={'If-None-Match': tag})
+            self.assertEqual(response.status_code, 304)
+
+    def test_etag_includes_mask(self):
+        api = restplus.Api(self.app)
+        model = api.model('Test', {'name': fields.String, 'age': fields.Integer})
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.etag(lambda: 'v1')
+            @api.marshal_with(model)
+            def get(self):
+                return {'name': 'John', 'age': 42}
+
+        tag = self.get('/test/').headers['ETag']
+        response = self.get('/test/', headers={'X-Fields': 'name', 'If-None-Match': tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], tag)
+
+    def test_etag_ignore_errors(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.etag()
+            def get(self):
+                return {'message': 'missing'}, 404
+
+        response = self.get('/test/')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+
+    def test_namespace_etag(self):
+        api = restplus.Api(self.app)
+        ns = api.namespace('ns')
+
+        @ns.route('/test/')
+        class Test(restplus.Resource):
+            @ns.etag(weak=True)
+            def get(self):
+                return {}
+
+        response = self.get('/ns/test/')
+        self.assertTrue(response.headers['ETag'].startswith('W/"'))
+        response = self.get('/ns/test/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_specs(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.etag()
+            def get(self):
+                return {}
+
+        with self.context():
+            specs = api.__schema__
+        operation = specs['paths']['/test/']['get']
+        self.assertIn({
+            'name': 'If-None-Match',
+            'in': 'header',
+            'type': 'string',
+            'description': 'An optional entity tag from a previous response',
+        }, operation['parameters'])
+        self.assertEqual(operation['responses']['304'], {'description': 'Not Modified'})
+        self.assertIn('ETag', operation['responses']['200']['headers'])
+
+
+class ResponseCacheTest(TestCase):
+    def get(self, url, **kwargs):
+        with self.app.test_client() as client:
+            return client.get(url, **kwargs)
+
+    def test_cache_response(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/<int:id>')
+        class Test(restplus.Resource):
+            @api.cache(ttl=60)
+            def get(self, id):
+                calls.append(id)
+                return {'id': id}
+
+        for _ in range(3):
+            response = self.get('/test/42')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data.decode('utf8')), {'id': 42})
+            self.assertEqual(response.content_type, 'application/json')
+        self.assertEqual(calls, [42])
+
+        self.get('/test/43')
+        self.get('/test/42?page=2')
+        self.assertEqual(calls, [42, 43, 42])
+
+    def test_cache_key_includes_mask(self):
+        api = restplus.Api(self.app)
+        model = api.model('Test', {'name': fields.String, 'age': fields.Integer})
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache()
+            @api.marshal_with(model)
+            def get(self):
+                return {'name': 'John', 'age': 42}
+
+        self.assertEqual(json.loads(self.get('/test/').data.decode('utf8')), {'name': 'John', 'age': 42})
+        response = self.get('/test/', headers={'X-Fields': 'name'})
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'name': 'John'})
+        response = self.get('/test/', headers={'X-Fields': '{name}'})
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'name': 'John'})
+
+    def test_cache_key_includes_vary_headers(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache(vary=['Accept-Language'])
+            def get(self):
+                calls.append(1)
+                return {}
+
+        self.get('/test/', headers={'Accept-Language': 'fr'})
+        self.get('/test/', headers={'Accept-Language': 'en'})
+        self.get('/test/', headers={'Accept-Language': 'fr'})
+        self.assertEqual(len(calls), 2)
+
+    def test_cache_only_successful_get(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache()
+            def get(self):
+                calls.append('get')
+                return {}, 404
+
+            @api.cache()
+            def post(self):
+                calls.append('post')
+                return {}
+
+        with self.app.test_client() as client:
+            for _ in range(2):
+                client.get('/test/')
+                client.post('/test/')
+        self.assertEqual(calls, ['get', 'post', 'get', 'post'])
+
+    def test_invalidate(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/<int:id>')
+        class Test(restplus.Resource):
+            @api.cache()
+            def get(self, id):
+                calls.append(id)
+                return {'id': id}
+
+        self.get('/test/1')
+        self.get('/test/2')
+        with self.app.test_request_context():
+            api.invalidate(Test, id=1)
+        self.get('/test/1')
+        self.get('/test/2')
+        self.assertEqual(calls, [1, 2, 1])
+
+        with self.app.test_request_context():
+            api.invalidate(Test)
+        self.get('/test/1')
+        self.get('/test/2')
+        self.assertEqual(calls, [1, 2, 1, 1, 2])
+
+    def test_file_cache(self):
+        directory = tempfile.mkdtemp()
+        try:
+            backend = FileCache(directory)
+            self.assertIsNone(backend.get('key'))
+            backend.set('key', {'value': 42})
+            self.assertEqual(backend.get('key'), {'value': 42})
+            backend.set('expired', 'value', ttl=-1)
+            self.assertIsNone(backend.get('expired'))
+            backend.delete('key')
+            self.assertIsNone(backend.get('key'))
+            backend.set('key', 'value')
+            backend.clear()
+            self.assertEqual(os.listdir(directory), [])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_file_cache_private_directory(self):
+        if os.name != 'posix':
+            self.skipTest('Permissions are only checked on POSIX systems')
+        root = tempfile.mkdtemp()
+        try:
+            directory = os.path.join(root, 'cache')
+            FileCache(directory).set('key', 'value')
+            self.assertEqual(os.stat(directory).st_mode & 0o777, 0o700)
+
+            os.chmod(directory, 0o777)
+            backend = FileCache(directory)
+            with self.assertRaises(OSError):
+                backend.get('key')
+            with self.assertRaises(OSError):
+                backend.set('key', 'value')
+        finally:
+            shutil.rmtree(root)
+
+    def test_shared_memory_cache_directory(self):
+        with self.context():
+            directory = SharedMemoryCache().directory
+        self.assertIn(self.app.import_name, os.path.basename(directory))
+        if hasattr(os, 'getuid'):
+            self.assertIn(str(os.getuid()), os.path.basename(directory))
+        self.assertNotEqual(SharedMemoryCache('other').directory, directory)
+
+    def test_cache_key_includes_credentials(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache()
+            def get(self):
+                return {'user': request.headers.get('Authorization')}
+
+        for user in 'first', 'second', 'first':
+            response = self.get('/test/', headers={'Authorization': user})
+            self.assertEqual(json.loads(response.data.decode('utf8')), {'user': user})
+
+    def test_memory_cache(self):
+        backend = MemoryCache(2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.set('c', 3)
+        self.assertIsNone(backend.get('a'))
+        self.assertEqual(backend.get('c'), 3)
+        backend.set('expired', 'value', ttl=-1)
+        self.assertIsNone(backend.get('expired'))
+
+    def test_configured_backend(self):
+        directory = tempfile.mkdtemp()
+        self.app.config['RESTPLUS_RESPONSE_CACHE'] = FileCache(directory)
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache()
+            def get(self):
+                calls.append(1)
+                return {'value': 'cached'}
+
+        try:
+            for _ in range(2):
+                response = self.get('/test/')
+                self.assertEqual(json.loads(response.data.decode('utf8')), {'value': 'cached'})
+            self.assertEqual(len(calls), 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_cache_specs(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache(ttl=60, vary=['Accept-Language'])
+            def get(self):
+                return {}
+
+        with self.context():
+            specs = api.__schema__
+        self.assertEqual(specs['paths']['/test/']['get']['x-cache'], {'ttl': 60, 'vary': ['Accept-Language']})
+
+
+class CoalesceTest(TestCase):
+    def concurrent_get(self, url, count=5, release=None, headers=None):
+        responses = []
+
+        def get(headers):
+            with self.app.test_client() as client:
+                responses.append(client.get(url, headers=headers))
+
+        headers = headers or [{}] * count
+        threads = [threading.Thread(target=get, args=(headers[i],)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_coalesce(self):
+        api = restplus.Api(self.app)
+        release = threading.Event()
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.coalesce()
+            def get(self):
+                calls.append(1)
+                release.wait(5)
+                return {'value': 42}
+
+        responses = self.concurrent_get('/test/', release=release)
+        self.assertEqual(len(calls), 1)
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data.decode('utf8')), {'value': 42})
+
+    def test_coalesce_errors(self):
+        api = restplus.Api(self.app)
+        release = threading.Event()
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.coalesce()
+            def get(self):
+                calls.append(1)
+                release.wait(5)
+                api.abort(403, 'Forbidden')
+
+        responses = self.concurrent_get('/test/', release=release)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.status_code for r in responses], [403] * 5)
+
+    def test_coalesce_vary(self):
+        api = restplus.Api(self.app)
+        release = threading.Event()
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.coalesce(vary=['Accept-Language'])
+            def get(self):
+                calls.append(1)
+                release.wait(5)
+                return {
+                    'user': request.headers.get('Authorization'),
+                    'language': request.headers.get('Accept-Language'),
+                }
+
+        headers = [
+            {'Authorization': 'first', 'Accept-Language': 'fr'},
+            {'Authorization': 'second', 'Accept-Language': 'fr'},
+            {'Authorization': 'first', 'Accept-Language': 'en'},
+        ] * 2
+        responses = self.concurrent_get('/test/', count=6, release=release, headers=headers)
+        self.assertEqual(len(calls), 3)
+        outputs = sorted((d['user'], d['language']) for d in (json.loads(r.data.decode('utf8')) for r in responses))
+        self.assertEqual(outputs, sorted([('first', 'fr'), ('second', 'fr'), ('first', 'en')] * 2))
+
+    def test_coalesce_timeout(self):
+        api = restplus.Api(self.app)
+        release = threading.Event()
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.coalesce(timeout=0.01)
+            def get(self):
+                calls.append(1)
+                release.wait(5)
+                return {}
+
+        responses = self.concurrent_get('/test/', count=3, release=release)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([r.status_code for r in responses], [200] * 3)
+
+    def test_sequential_requests_are_not_coalesced(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.coalesce()
+            def get(self):
+                calls.append(1)
+                return {'count': len(calls)}
+
+        with self.app.test_client() as client:
+            self.assertEqual(json.loads(client.get('/test/').data.decode('utf8')), {'count': 1})
+            self.assertEqual(json.loads(client.get('/test/').data.decode('utf8')), {'count': 2})
+
+
+class CacheControlTest(TestCase):
+    def get(self, url, **kwargs):
+        with self.app.test_client() as client:
+            return client.get(url, **kwargs)
+
+    def test_cache_control(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache_control(max_age=60, public=True, vary=['Accept-Language', 'Authorization'])
+            def get(self):
+                return {}
+
+        response = self.get('/test/')
+        self.assertEqual(response.headers['Cache-Control'], 'public, max-age=60')
+        self.assertEqual(response.headers['Vary'], 'Accept-Language, Authorization')
+        self.assertIn('Expires', response.headers)
+
+    def test_resource_level_cache_settings(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        @api.doc(cache={'private': True, 'max_age': 10})
+        class Test(restplus.Resource):
+            def get(self):
+                return {}
+
+            @api.doc(cache={'no_store': True, 'max_age': None})
+            def post(self):
+                return {}
+
+        with self.app.test_client() as client:
+            self.assertEqual(client.get('/test/').headers['Cache-Control'], 'private, max-age=10')
+            response = client.post('/test/')
+            self.assertEqual(response.headers['Cache-Control'], 'private, no-store')
+            self.assertNotIn('Expires', response.headers)
+
+    def test_handler_headers_take_precedence(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache_control(max_age=60)
+            def get(self):
+                return {}, 200, {'Cache-Control': 'no-cache'}
+
+        self.assertEqual(self.get('/test/').headers['Cache-Control'], 'no-cache')
+
+    def test_errors(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/default/')
+        class Default(restplus.Resource):
+            @api.cache_control(max_age=60)
+            def get(self):
+                api.abort(404)
+
+        @api.route('/errors/')
+        class Errors(restplus.Resource):
+            @api.cache_control(max_age=60, errors=True)
+            def get(self):
+                api.abort(404)
+
+        @api.route('/returned/')
+        class Returned(restplus.Resource):
+            @api.cache_control(max_age=60)
+            def get(self):
+                return {}, 404
+
+        self.assertNotIn('Cache-Control', self.get('/default/').headers)
+        self.assertNotIn('Cache-Control', self.get('/returned/').headers)
+        response = self.get('/errors/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.headers['Cache-Control'], 'max-age=60')
+
+    def test_cache_control_specs(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.cache_control(max_age=60, public=True, vary=['Accept-Language'])
+            @api.response(200, 'Success')
+            @api.response(404, 'Not found')
+            def get(self):
+                return {}
+
+        with self.context():
+            specs = api.__schema__
+        responses = specs['paths']['/test/']['get']['responses']
+        self.assertEqual(responses['200']['headers'], {
+            'Cache-Control': {'type': 'string', 'default': 'public, max-age=60'},
+            'Expires': {'type': 'string', 'description': 'The response expiration date'},
+            'Vary': {'type': 'string', 'default': 'Accept-Language'},
+        })
+        self.assertNotIn('headers', responses['404'])
+
+
+class SqliteCacheTest(TestCase):
+    def test_backend(self):
+        directory = tempfile.mkdtemp()
+        try:
+            backend = SqliteCache(os.path.join(directory, 'cache.db'))
+            self.assertIsNone(backend.get('key'))
+            backend.set('key', {'value': 42})
+            self.assertEqual(backend.get('key'), {'value': 42})
+            self.assertFalse(backend.add('key', 'other'))
+            self.assertEqual(backend.get('key'), {'value': 42})
+            backend.set('expired', 'value', ttl=-1)
+            self.assertIsNone(backend.get('expired'))
+            self.assertTrue(backend.add('expired', 'new'))
+            self.assertEqual(backend.get('expired'), 'new')
+            backend.delete('key')
+            self.assertIsNone(backend.get('key'))
+            backend.clear()
+            self.assertIsNone(backend.get('expired'))
+        finally:
+            shutil.rmtree(directory)
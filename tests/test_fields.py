@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import warnings
+
 from datetime import date, datetime
 from decimal import Decimal
 from functools import partial
@@ -8,7 +10,7 @@ from functools import partial
 import pytz
 
 from flask import Blueprint, Flask
-from flask_restplus import fields, Api
+from flask_restplus import fields, marshal, Api
 
 from flask_restplus._compat import OrderedDict
 
@@ -796,6 +798,78 @@ class NestedFieldTest(FieldTestCase):
         field = fields.Nested(nested_fields)
         assert_equal(field.__schema__, {'$ref': '#/definitions/NestedModel'})
 
+    def authors_loader(self):
+        authors = {1: {'name': 'John'}, 2: {'name': 'Jane'}}
+        calls = []
+
+        def load_authors(ids):
+            calls.append(ids)
+            # Unordered results
+            return dict((id, authors[id]) for id in reversed(ids) if id in authors)
+        return load_authors, calls
+
+    def test_loader(self):
+        author = self.api.model('Author', {'name': fields.String})
+        loader, calls = self.authors_loader()
+        model = {
+            'title': fields.String,
+            'author': fields.Nested(author, attribute='author_id', loader=loader, allow_null=True),
+        }
+        posts = [{'title': 'A', 'author_id': 1}, {'title': 'B', 'author_id': 2},
+                 {'title': 'C', 'author_id': 1}, {'title': 'D', 'author_id': 3}]
+
+        assert_equal(marshal(posts, model), [
+            {'title': 'A', 'author': {'name': 'John'}},
+            {'title': 'B', 'author': {'name': 'Jane'}},
+            {'title': 'C', 'author': {'name': 'John'}},
+            {'title': 'D', 'author': None},
+        ])
+        assert_equal(calls, [[1, 2, 3]])
+
+    def test_loader_with_lists(self):
+        author = self.api.model('Author', {'name': fields.String})
+        loader, calls = self.authors_loader()
+        model = {
+            'authors': fields.Nested(author, attribute='author_ids', loader=loader, as_list=True),
+            'reviewers': fields.List(fields.Nested(author, loader=loader), attribute='reviewer_ids'),
+        }
+        books = [{'author_ids': [1, 2], 'reviewer_ids': [2]}, {'author_ids': [2], 'reviewer_ids': [1]}]
+
+        assert_equal(marshal(books, model), [
+            {'authors': [{'name': 'John'}, {'name': 'Jane'}], 'reviewers': [{'name': 'Jane'}]},
+            {'authors': [{'name': 'Jane'}], 'reviewers': [{'name': 'John'}]},
+        ])
+        assert_equal(calls, [[1, 2]])
+
+    def test_loader_returning_mapping(self):
+        author = self.api.model('Author', {'name': fields.String})
+        field = fields.Nested(author, loader=lambda ids: dict((id, {'name': str(id)}) for id in ids))
+        assert_equal(field.output('author', {'author': 42}), {'name': '42'})
+
+    def test_loader_returning_list(self):
+        author = self.api.model('Author', {'name': fields.String})
+        field = fields.Nested(author, loader=lambda ids: [{'name': str(id)} for id in ids])
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            assert_equal(marshal({'authors': [1, 2]}, {'authors': fields.List(field)}),
+                         {'authors': [{'name': '1'}, {'name': '2'}]})
+        assert_equal(len(caught), 1)
+        assert_in('same order', str(caught[0].message))
+
+    def test_loader_errors(self):
+        author = self.api.model('Author', {'name': fields.String})
+
+        def fail(ids):
+            raise ValueError('Unavailable')
+
+        with assert_raises(fields.MarshallingError):
+            marshal({'author': 1}, {'author': fields.Nested(author, loader=fail)})
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            with assert_raises(fields.MarshallingError):
+                marshal({'author': 1}, {'author': fields.Nested(author, loader=lambda ids: [])})
+
 
 class ListFieldTest(BaseFieldTestMixin, FieldTestCase):
     field_class = partial(fields.List, fields.String)
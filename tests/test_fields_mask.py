@@ -108,6 +108,51 @@ class MaskMixin(object):
     def test_support_underscore(self):
         self.assertEqual(Mask('field_name'), {'field_name': True})
 
+    def test_exclusion(self):
+        parsed = Mask('*, -field1, nested{-field2}')
+        expected = {
+            '*': True,
+            'field1': False,
+            'nested': {
+                'field2': False,
+            },
+        }
+        self.assertDataEqual(parsed, expected)
+
+    def test_exclusion_str(self):
+        self.assertEqual(str(Mask('*,-field1,nested{-field2}')), '{*,-field1,nested{-field2}}')
+
+    def test_arguments(self):
+        parsed = Mask('children(limit:5){name}, tags(limit:2)')
+        self.assertEqual(parsed['children'], {'name': True})
+        self.assertEqual(parsed['children'].args, {'limit': 5})
+        self.assertEqual(parsed['tags'], {})
+        self.assertEqual(parsed['tags'].args, {'limit': 2})
+
+    def test_arguments_str(self):
+        mask_str = '{children(limit:5){name},tags(limit:2)}'
+        self.assertEqual(str(Mask(mask_str)), mask_str)
+
+    def test_unknown_argument(self):
+        with self.assertRaises(mask.ParseError):
+            Mask('children(unknown:5)')
+
+    def test_invalid_argument(self):
+        with self.assertRaises(mask.ParseError):
+            Mask('children(limit:five)')
+
+    def test_unexpected_opening_parenthesis(self):
+        with self.assertRaises(mask.ParseError):
+            Mask('(limit:5)')
+
+    def test_unexpected_star_exclusion(self):
+        with self.assertRaises(mask.ParseError):
+            Mask('-*')
+
+    def test_unexpected_opening_bracket_on_exclusion(self):
+        with self.assertRaises(mask.ParseError):
+            Mask('-nested{field}')
+
 
 class MaskUnwrapped(MaskMixin, TestCase):
     def parse(self, value):
@@ -437,6 +482,103 @@ class ApplyMaskTest(TestCase):
         result = mask.apply(data, '{list{integer}}')
         self.assertEqual(result, {'list': [{'integer': 42}, {'integer': 404}]})
 
+    def test_exclusion_with_star(self):
+        data = {
+            'integer': 42,
+            'string': 'a string',
+            'boolean': True,
+        }
+        result = mask.apply(data, '{*,-string}')
+        self.assertEqual(result, {'integer': 42, 'boolean': True})
+
+    def test_exclusion_only(self):
+        data = {
+            'integer': 42,
+            'nested': {
+                'integer': 42,
+                'string': 'a string',
+            }
+        }
+        result = mask.apply(data, '{nested{-string}}')
+        self.assertEqual(result, {'nested': {'integer': 42}})
+
+    def test_exclusion_api_fields(self):
+        family_fields = {
+            'father': fields.Nested(person_fields),
+            'mother': fields.Nested(person_fields),
+        }
+
+        result = mask.apply(family_fields, '*,-mother,father{-age}')
+        self.assertEqual(set(result.keys()), set(['father']))
+
+        data = {
+            'father': {'name': 'John', 'age': 42},
+            'mother': {'name': 'Jane', 'age': 42},
+        }
+        self.assertDataEqual(marshal(data, result), {'father': {'name': 'John'}})
+
+    def test_list_limit(self):
+        data = {
+            'list': [{'integer': 1, 'string': 'a'}, {'integer': 2, 'string': 'b'}, {'integer': 3, 'string': 'c'}],
+            'other': [1, 2, 3],
+        }
+        result = mask.apply(data, '{list(limit:2){integer},other(limit:1)}')
+        self.assertEqual(result, {'list': [{'integer': 1}, {'integer': 2}], 'other': [1]})
+
+    def test_list_limit_api_fields(self):
+        model = {
+            'name': fields.String,
+            'children': fields.List(fields.Nested(person_fields)),
+            'tags': fields.List(fields.String),
+            'friends': fields.Nested(person_fields, as_list=True),
+        }
+
+        result = mask.apply(model, 'children(limit:1){name},tags(limit:2),friends(limit:1)')
+
+        data = {
+            'name': 'John',
+            'children': [{'name': 'Jane', 'age': 5}, {'name': 'Jack', 'age': 7}],
+            'tags': ['a', 'b', 'c'],
+            'friends': [{'name': 'Joe', 'age': 40}, {'name': 'Jim', 'age': 41}],
+        }
+        self.assertDataEqual(marshal(data, result), {
+            'children': [{'name': 'Jane'}],
+            'tags': ['a', 'b'],
+            'friends': [{'name': 'Joe', 'age': 40}],
+        })
+        # Should leave the original fields untouched
+        self.assertEqual(len(marshal(data, model)['children']), 2)
+
+    def test_list_limit_slice_lazy_sequences(self):
+        class Query(list):
+            '''Mimic a lazy query pushing slices down'''
+            sliced = None
+
+            def __getitem__(self, key):
+                if isinstance(key, slice):
+                    Query.sliced = key
+                return super(Query, self).__getitem__(key)
+
+        model = {'tags': fields.List(fields.String)}
+        result = mask.apply(model, 'tags(limit:2)')
+
+        self.assertEqual(marshal({'tags': Query(['a', 'b', 'c'])}, result), {'tags': ['a', 'b']})
+        self.assertEqual(Query.sliced, slice(None, 2))
+
+    def test_list_limit_on_non_list_fields(self):
+        model = {
+            'name': fields.String,
+            'nickname': fields.String(),
+            'author': fields.Nested(person_fields),
+            'extra': fields.Raw,
+        }
+
+        for field in model:
+            with self.assertRaises(mask.MaskError):
+                mask.apply(model, '{0}(limit:2)'.format(field))
+        with self.assertRaises(mask.MaskError):
+            mask.apply(model, 'author(limit:2){name}')
+
     def test_missing_field_none_by_default(self):
         result = mask.apply({}, '{integer}')
         self.assertEqual(result, {'integer': None})
@@ -810,6 +952,38 @@ class MaskAPI(TestCase):
             'age': 42,
         })
 
+    def test_marshal_does_not_hit_excluded_attributes(self):
+        api = Api(self.app)
+
+        model = api.model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+            'boolean': fields.Boolean,
+        })
+
+        class Person(object):
+            def __init__(self, name, age):
+                self.name = name
+                self.age = age
+
+            @property
+            def boolean(self):
+                raise Exception()
+
+        @api.route('/test/')
+        class TestResource(Resource):
+            @api.marshal_with(model)
+            def get(self):
+                return Person('John Doe', 42)
+
+        data = self.get_json('/test/', headers={
+            'X-Fields': '{*,-boolean}'
+        })
+        self.assertEqual(data, {
+            'name': 'John Doe',
+            'age': 42,
+        })
+
     def test_marshal_with_skip_missing_fields(self):
         api = Api(self.app)
 
@@ -930,6 +1104,69 @@ class MaskAPI(TestCase):
             'owner': {'name': 'child2'},
         })
 
+    def test_marshal_with_honour_view_header(self):
+        api = Api(self.app)
+
+        model = api.model('Test', {
+            'name': fields.String,
+            'age': fields.Integer,
+            'boolean': fields.Boolean,
+        }, views={'summary': '{name}'})
+
+        @api.route('/test/')
+        class TestResource(Resource):
+            @api.marshal_with(model)
+            def get(self):
+                return {
+                    'name': 'John Doe',
+                    'age': 42,
+                    'boolean': True
+                }
+
+        data = self.get_json('/test/', headers={'X-View': 'summary'})
+        self.assertEqual(data, {'name': 'John Doe'})
+
+        # Header mask takes precedence over view
+        data = self.get_json('/test/', headers={'X-View': 'summary', 'X-Fields': 'age'})
+        self.assertEqual(data, {'age': 42})
+
+    def test_marshal_with_honour_view_arg(self):
+        api = Api(self.app)
+        self.app.config['RESTPLUS_VIEW_ARG'] = 'view'
+
+        model = api.model('Test', {
+            'name': fields.String,
+            'age': fields.Integer,
+        }, views={'summary': '{name}'})
+
+        @api.route('/test/')
+        class TestResource(Resource):
+            @api.marshal_with(model)
+            def get(self):
+                return {
+                    'name': 'John Doe',
+                    'age': 42,
+                }
+
+        data = self.get_json('/test/?view=summary')
+        self.assertEqual(data, {'name': 'John Doe'})
+
+    def test_raise_400_on_unknown_view(self):
+        api = Api(self.app)
+
+        model = api.model('Test', {
+            'name': fields.String,
+        }, views={'summary': '{name}'})
+
+        @api.route('/test/')
+        class TestResource(Resource):
+            @api.marshal_with(model)
+            def get(self):
+                return {'name': 'John Doe'}
+
+        data = self.get_json('/test/', status=400, headers={'X-View': 'unknown'})
+        self.assertIn('message', data)
+
     def test_raise_400_on_invalid_mask(self):
         api = Api(self.app)
 
@@ -1040,6 +1277,29 @@ class SwaggerMaskHeaderTest(TestCase):
 
         self.assertNotIn('parameters', op)
 
+    def test_marshal_with_expose_views(self):
+        api = Api(self.app)
+
+        model = api.model('Test', {
+            'name': fields.String,
+            'age': fields.Integer,
+        }, views={'summary': '{name}', 'full': '*'})
+
+        @api.route('/test/')
+        class TestResource(Resource):
+            @api.marshal_with(model)
+            def get(self):
+                pass
+
+        specs = self.get_specs()
+        op = specs['paths']['/test/']['get']
+
+        self.assertEqual(len(op['parameters']), 2)
+        param = op['parameters'][1]
+        self.assertEqual(param['name'], 'X-View')
+        self.assertEqual(param['in'], 'header')
+        self.assertEqual(param['enum'], ['full', 'summary'])
+
     def test_is_only_exposed_on_marshal_with(self):
         api = Api(self.app)
 
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import flask_restplus as restplus
+
+from flask_restplus.caching import MemoryCache, SqliteCache
+
+from . import TestCase
+
+
+class IdempotencyTest(TestCase):
+    def post(self, url, data=None, key=None, **kwargs):
+        headers = kwargs.pop('headers', {})
+        if key:
+            headers['Idempotency-Key'] = key
+        with self.app.test_client() as client:
+            return client.post(url, data=json.dumps(data or {}), headers=headers,
+                               content_type='application/json', **kwargs)
+
+    def create_api(self, calls, **kwargs):
+        api = restplus.Api(self.app)
+
+        @api.route('/orders/')
+        class Orders(restplus.Resource):
+            @api.idempotent(**kwargs)
+            def post(self):
+                calls.append(api.payload)
+                return {'id': len(calls)}, 201
+
+        return api
+
+    def test_replay(self):
+        calls = []
+        self.create_api(calls)
+
+        response = self.post('/orders/', {'item': 'book'}, key='abc')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response.headers)
+
+        response = self.post('/orders/', {'item': 'book'}, key='abc')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'id': 1})
+        self.assertEqual(response.headers['Idempotent-Replayed'], 'true')
+        self.assertEqual(len(calls), 1)
+
+        response = self.post('/orders/', {'item': 'book'}, key='def')
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'id': 2})
+
+    def test_scoped_by_credentials(self):
+        calls = []
+        self.create_api(calls)
+
+        for user in 'first', 'second':
+            response = self.post('/orders/', {'item': 'book'}, key='abc', headers={'Authorization': user})
+            self.assertEqual(response.status_code, 201)
+            self.assertNotIn('Idempotent-Replayed', response.headers)
+        self.assertEqual(len(calls), 2)
+
+    def test_without_key(self):
+        calls = []
+        self.create_api(calls)
+        self.post('/orders/', {'item': 'book'})
+        self.post('/orders/', {'item': 'book'})
+        self.assertEqual(len(calls), 2)
+
+    def test_bare_decorator(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/orders/')
+        class Orders(restplus.Resource):
+            @api.idempotent
+            def post(self):
+                calls.append(1)
+                return {}
+
+        self.post('/orders/', key='abc')
+        self.post('/orders/', key='abc')
+        self.assertEqual(len(calls), 1)
+
+    def test_key_reused_with_another_payload(self):
+        calls = []
+        self.create_api(calls)
+        self.post('/orders/', {'item': 'book'}, key='abc')
+        response = self.post('/orders/', {'item': 'pen'}, key='abc')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(len(calls), 1)
+
+    def test_errors_are_not_recorded(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/orders/')
+        class Orders(restplus.Resource):
+            @api.idempotent
+            def post(self):
+                calls.append(1)
+                if len(calls) == 1:
+                    raise ValueError('Boom')
+                return {}, 201
+
+        self.assertEqual(self.post('/orders/', key='abc').status_code, 500)
+        self.assertEqual(self.post('/orders/', key='abc').status_code, 201)
+        self.assertEqual(self.post('/orders/', key='abc').status_code, 201)
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_duplicates(self):
+        api = restplus.Api(self.app)
+        release = threading.Event()
+        calls = []
+
+        @api.route('/orders/')
+        class Orders(restplus.Resource):
+            @api.idempotent
+            def post(self):
+                calls.append(1)
+                release.wait(5)
+                return {'id': len(calls)}, 201
+
+        responses = []
+
+        def post():
+            responses.append(self.post('/orders/', key='abc'))
+
+        threads = [threading.Thread(target=post) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.status_code for r in responses], [201] * 3)
+        self.assertEqual(len([r for r in responses if 'Idempotent-Replayed' in r.headers]), 2)
+
+    def test_pending_in_another_process(self):
+        class ConcurrentStore(MemoryCache):
+            '''Simulate another process recording the key first'''
+            def add(self, key, value, ttl=None):
+                self.set(key, ('pending', hashlib.sha1(b'{}').hexdigest(), None))
+                return False
+
+        self.app.config['RESTPLUS_IDEMPOTENCY_STORE'] = ConcurrentStore()
+        calls = []
+        self.create_api(calls)
+        response = self.post('/orders/', key='abc')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(calls, [])
+
+    def test_sqlite_store(self):
+        directory = tempfile.mkdtemp()
+        self.app.config['RESTPLUS_IDEMPOTENCY_STORE'] = SqliteCache(os.path.join(directory, 'idempotency.db'))
+        calls = []
+        self.create_api(calls)
+        try:
+            self.post('/orders/', {'item': 'book'}, key='abc')
+            response = self.post('/orders/', {'item': 'book'}, key='abc')
+            self.assertEqual(response.headers['Idempotent-Replayed'], 'true')
+            self.assertEqual(len(calls), 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_specs(self):
+        calls = []
+        api = self.create_api(calls)
+        with self.context():
+            specs = api.__schema__
+        operation = specs['paths']['/orders/']['post']
+        self.assertIn({
+            'name': 'Idempotency-Key',
+            'in': 'header',
+            'type': 'string',
+            'description': 'An optional unique key to safely retry the request',
+        }, operation['parameters'])
+        self.assertIn('409', operation['responses'])
+        self.assertIn('422', operation['responses'])
@@ -2,14 +2,14 @@
 from __future__ import unicode_literals
 
 from flask_restplus import (
-    marshal, marshal_with, marshal_with_field, fields, Api, Resource
+    marshal, marshal_with, marshal_with_field, fields, Api, Model, Resource
 )
 
 try:
     from collections import OrderedDict
 except ImportError:
     from ordereddict import OrderedDict
-from . import TestCase
+from . import TestCase, patch
 
 
 # Add a dummy Resource to verify that the app is properly set.
@@ -297,3 +297,191 @@ class MarshallingTestCase(TestCase):
         resp = app.get('/api')
         self.assertEquals(resp.status_code, 200)
         self.assertEquals(resp.data.decode('utf-8'), '{"foo": 3.0}\n')
+
+
+class DeferredMarshallingTest(TestCase):
+    def setUp(self):
+        super(DeferredMarshallingTest, self).setUp()
+        try:
+            from concurrent.futures import Future, ThreadPoolExecutor
+        except ImportError:
+            self.skipTest('concurrent.futures is not available')
+        self.Future = Future
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def resolved(self, value):
+        future = self.Future()
+        future.set_result(value)
+        return future
+
+    def test_marshal_futures(self):
+        model = {
+            'name': fields.String,
+            'count': fields.Integer,
+            'tags': fields.List(fields.String),
+            'nested': fields.Nested({'value': fields.Integer}),
+            'missing': fields.Integer(default=42),
+        }
+        data = {
+            'name': 'John',
+            'count': self.executor.submit(lambda: '3'),
+            'tags': self.resolved(['a', 'b']),
+            'nested': self.resolved({'value': self.resolved('5')}),
+            'missing': self.resolved(None),
+        }
+        output = marshal([data, data], model)
+        expected = {'name': 'John', 'count': 3, 'tags': ['a', 'b'], 'nested': {'value': 5}, 'missing': 42}
+        self.assertEqual(output, [expected, expected])
+
+    def test_marshal_futures_resolved_together(self):
+        resolutions = []
+
+        def wait(value):
+            future = self.Future()
+            resolutions.append(future)
+            return future
+
+        model = {'count': fields.Integer}
+        futures = [wait(i) for i in range(3)]
+        data = [{'count': future} for future in futures]
+
+        # Futures are only awaited once the whole output is collected
+        from flask_restplus import deferred
+        original_wait = deferred.wait
+
+        def resolve_all(values):
+            self.assertEqual(len(values), 3)
+            for i, future in enumerate(resolutions):
+                future.set_result(i)
+            return original_wait(values)
+
+        with patch('flask_restplus.deferred.wait', side_effect=resolve_all):
+            self.assertEqual(marshal(data, model), [{'count': 0}, {'count': 1}, {'count': 2}])
+
+    def test_field_output_outside_marshal(self):
+        field = fields.Integer()
+        self.assertEqual(field.output('count', {'count': self.resolved('7')}), 7)
+
+    def test_deferred_errors(self):
+        def fail():
+            raise ValueError('Upstream failure')
+
+        model = {'count': fields.Integer}
+        with self.assertRaises(fields.MarshallingError) as cm:
+            marshal({'count': self.executor.submit(fail)}, model)
+        self.assertEqual(str(cm.exception), 'Upstream failure')
+
+        with self.assertRaises(fields.MarshallingError):
+            marshal({'count': self.resolved('not an int')}, model)
+
+
+class CountingString(fields.String):
+    def __init__(self, calls, **kwargs):
+        # Models fields are deep copied, not functions
+        self.record = lambda value: calls.append(value)
+        super(CountingString, self).__init__(**kwargs)
+
+    def format(self, value):
+        self.record(value)
+        return super(CountingString, self).format(value)
+
+
+class Entity(object):
+    def __init__(self, id, name, version=1):
+        self.id = id
+        self.name = name
+        self.version = version
+
+    @property
+    def __cache_key__(self):
+        return self.id, self.version
+
+
+class MarshalCacheTest(TestCase):
+    def test_reuse_outputs_by_version(self):
+        calls = []
+        model = Model('Entity', {'name': CountingString(calls)}, cache=True)
+        entity = Entity(1, 'first')
+
+        self.assertEqual(marshal(entity, model), {'name': 'first'})
+        self.assertEqual(marshal([entity, entity], model), [{'name': 'first'}, {'name': 'first'}])
+        self.assertEqual(calls, ['first'])
+
+        entity.name, entity.version = 'updated', 2
+        self.assertEqual(marshal(entity, model), {'name': 'updated'})
+        self.assertEqual(calls, ['first', 'updated'])
+
+    def test_mutated_outputs_not_cached(self):
+        model = Model('Entity', {
+            'name': fields.String,
+            'tags': fields.List(fields.String),
+            'nested': fields.Nested({'name': fields.String}),
+        }, cache=True)
+        entity = Entity(1, 'first')
+        entity.tags = ['a']
+        entity.nested = {'name': 'nested'}
+        expected = {'name': 'first', 'tags': ['a'], 'nested': {'name': 'nested'}}
+
+        output = marshal(entity, model)
+        output['name'] = 'mutated'
+        output['tags'].append('b')
+        output['nested']['name'] = 'mutated'
+
+        output = marshal(entity, model)
+        self.assertEqual(output, expected)
+        output['tags'].append('c')
+        self.assertEqual(marshal(entity, model), expected)
+
+    def test_without_cache(self):
+        calls = []
+        model = Model('Entity', {'name': CountingString(calls)})
+        entity = Entity(1, 'first')
+        marshal(entity, model)
+        marshal(entity, model)
+        self.assertEqual(calls, ['first', 'first'])
+
+    def test_configured_cache_key(self):
+        calls = []
+        model = Model('Entity', {'id': fields.Integer, 'name': CountingString(calls)},
+                      cache=10, cache_key='etag')
+        data = {'id': 1, 'name': 'first', 'etag': 'a'}
+        marshal(data, model)
+        marshal(data, model)
+        marshal({'id': 1, 'name': 'first'}, model)  # Not cacheable without key
+        self.assertEqual(calls, ['first', 'first'])
+
+    def test_keyed_by_mask(self):
+        calls = []
+        model = Model('Entity', {'id': fields.Integer, 'name': CountingString(calls)}, cache=True)
+        entity = Entity(1, 'first')
+        self.assertEqual(marshal(entity, model, mask='id'), {'id': 1})
+        self.assertEqual(marshal(entity, model), {'id': 1, 'name': 'first'})
+        self.assertEqual(marshal(entity, model, mask='id'), {'id': 1})
+        self.assertEqual(calls, ['first'])
+
+    def test_nested_cached_model(self):
+        calls = []
+        child = Model('Child', {'id': fields.Integer, 'name': CountingString(calls)}, cache=True)
+        parent = Model('Parent', {'children': fields.List(fields.Nested(child))})
+        entity = Entity(1, 'child')
+        data = {'children': [entity, entity]}
+
+        self.assertEqual(marshal(data, parent), {'children': [{'id': 1, 'name': 'child'}] * 2})
+        self.assertEqual(marshal(data, parent, mask='children{name}'), {'children': [{'name': 'child'}] * 2})
+        self.assertEqual(marshal(data, parent, mask='children{name}'), {'children': [{'name': 'child'}] * 2})
+        self.assertEqual(calls, ['child', 'child'])
+
+    def test_deferred_outputs_not_cached(self):
+        try:
+            from concurrent.futures import Future
+        except ImportError:
+            self.skipTest('concurrent.futures is not available')
+        model = Model('Entity', {'name': fields.String}, cache=True)
+        future = Future()
+        future.set_result('deferred')
+        entity = Entity(1, future)
+        self.assertEqual(marshal(entity, model), {'name': 'deferred'})
+        self.assertEqual(len(model.outputs), 0)
@@ -2,9 +2,9 @@
 from __future__ import unicode_literals
 
 from flask import Blueprint
-from flask_restplus import fields, Api
+from flask_restplus import fields, mask, marshal, Api
 
-from . import TestCase
+from . import TestCase, patch
 
 
 class ModelTestCase(TestCase):
@@ -388,3 +388,62 @@ class ModelTestCase(TestCase):
                 'child': {'$ref': '#/definitions/Person'},
             }
         })
+
+    def test_views_are_precompiled(self):
+        model = self.api.model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+            'birthdate': fields.DateTime,
+        }, views={'summary': '{name}', 'full': '*'})
+
+        self.assertIn('compiled_views', model.__dict__)
+        self.assertEqual(set(model.view('summary').keys()), set(['name']))
+        self.assertEqual(set(model.view('full').keys()), set(['name', 'age', 'birthdate']))
+        self.assertIs(model.view('summary'), model.view('summary'))
+
+    def test_unknown_view(self):
+        model = self.api.model('Person', {
+            'name': fields.String,
+        }, views={'summary': '{name}'})
+
+        with self.assertRaises(mask.MaskError):
+            model.view('unknown')
+
+    def test_projection_is_cached(self):
+        model = self.api.model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+        })
+
+        self.assertIs(model.projection(), model.resolved)
+        projection = model.projection('{name}')
+        self.assertEqual(list(projection.keys()), ['name'])
+        self.assertIs(model.projection('{name}'), projection)
+        self.assertIs(model.projection(mask.Mask('{name}')), projection)
+
+    def test_projection_use_default_mask(self):
+        model = self.api.model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+        }, mask='{name}')
+
+        self.assertEqual(list(model.projection().keys()), ['name'])
+        self.assertIs(model.projection(), model.projection())
+        self.assertEqual(list(model.projection('age').keys()), ['age'])
+
+    def test_nested_default_mask_is_applied_once(self):
+        person = self.api.model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+        }, mask='{name}')
+        family = self.api.model('Family', {
+            'members': fields.List(fields.Nested(person)),
+        })
+
+        data = {'members': [{'name': 'John', 'age': 42}, {'name': 'Jane', 'age': 41}]}
+
+        with patch('flask_restplus.model.apply_mask', wraps=mask.apply) as apply:
+            self.assertEqual(marshal(data, family), {'members': [{'name': 'John'}, {'name': 'Jane'}]})
+            self.assertEqual(apply.call_count, 1)
+            marshal(data, family)
+            self.assertEqual(apply.call_count, 1)
@@ -5,7 +5,7 @@ import json
 
 import flask_restplus as restplus
 
-from . import TestCase
+from . import TestCase, patch
 
 
 class PayloadTestCase(TestCase):
@@ -274,3 +274,147 @@ class PayloadTestCase(TestCase):
                                   headers={'content-type': 'application/json'})
 
             self.assertEquals(response.status_code, 200)
+
+    def test_validator_is_cached(self):
+        api = restplus.Api(self.app, validate=True)
+
+        fields = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+            'age': restplus.fields.Integer,
+        })
+
+        @api.route('/validation/')
+        class Validation(restplus.Resource):
+            @api.expect(fields)
+            def post(self):
+                return {}
+
+        self.assertEqual(self.post('/validation/', {'name': 'John'}).status_code, 200)
+        validator = fields.validator(api.refresolver)
+        self.assert_errors(self.post('/validation/', {'age': 'not an int'}), 'name', 'age')
+        self.assertIs(fields.validator(api.refresolver), validator)
+        self.assertEqual(len(fields.validators), 1)
+
+    def test_validation_does_not_build_specs(self):
+        api = restplus.Api(self.app, validate=True)
+
+        address = api.model('Address', {
+            'road': restplus.fields.String(required=True),
+        })
+        fields = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+            'address': restplus.fields.Nested(address),
+        })
+
+        @api.route('/validation/')
+        class Validation(restplus.Resource):
+            @api.expect(fields)
+            def post(self):
+                return {}
+
+        with patch('flask_restplus.api.Swagger') as Swagger:
+            self.assertEqual(self.post('/validation/', {'name': 'John', 'address': {'road': 'main'}}).status_code, 200)
+            self.assert_errors(self.post('/validation/', {'name': 'John', 'address': {}}), 'address.road')
+            self.assertFalse(Swagger.called)
+
+    def test_refresolver_resolve_registered_models(self):
+        api = restplus.Api(self.app)
+
+        api.model('Unexposed', {
+            'name': restplus.fields.String(required=True),
+        })
+
+        url, schema = api.refresolver.resolve('#/definitions/Unexposed')
+        self.assertEqual(schema, api.models['Unexposed'].__schema__)
+
+    def test_validation_on_array_body(self):
+        api = restplus.Api(self.app, validate=True)
+
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+            'age': restplus.fields.Integer,
+        })
+
+        @api.route('/validation/')
+        class Bulk(restplus.Resource):
+            @api.expect([person])
+            def post(self):
+                return {}
+
+        response = self.post('/validation/', [{'name': 'John'}, {'name': 'Jane', 'age': 42}])
+        self.assertEqual(response.status_code, 200)
+
+        response = self.post('/validation/', [{'name': 'John'}, {'age': 'nope'}, {}])
+        self.assert_errors(response, '1', '2')
+        out = json.loads(response.data.decode('utf8'))
+        self.assertEqual(set(out['errors']['1'].keys()), set(['name', 'age']))
+        self.assertEqual(list(out['errors']['2'].keys()), ['name'])
+
+        response = self.post('/validation/', {'name': 'John'})
+        self.assert_errors(response, '')
+
+    def test_validation_on_array_body_stop_after_max_errors(self):
+        self.app.config['RESTPLUS_MAX_VALIDATION_ERRORS'] = 2
+        api = restplus.Api(self.app, validate=True)
+
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+        })
+
+        @api.route('/validation/')
+        class Bulk(restplus.Resource):
+            @api.expect([person])
+            def post(self):
+                return {}
+
+        response = self.post('/validation/', [{}, {'name': 'John'}, {}, {}, {}])
+        self.assert_errors(response, '0', '2')
+        out = json.loads(response.data.decode('utf8'))
+        self.assertEqual(len(out['errors']), 2)
+
+    def test_payload_decoded_once(self):
+        calls = []
+
+        def decoder(data):
+            calls.append(data)
+            return json.loads(data)
+
+        self.app.config['RESTPLUS_JSON_DECODER'] = decoder
+        api = restplus.Api(self.app, validate=True)
+
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+        })
+        parser = api.parser()
+        parser.add_argument('name', location='json')
+        parser.add_argument('age', type=int, location=('json', 'values'))
+
+        @api.route('/validation/')
+        class Payload(restplus.Resource):
+            @api.expect(person)
+            def post(self):
+                args = parser.parse_args()
+                return {'payload': api.payload, 'name': args['name'], 'age': args['age']}
+
+        response = self.post('/validation/', {'name': 'John', 'age': 42})
+        self.assertEqual(response.status_code, 200)
+        out = json.loads(response.data.decode('utf8'))
+        self.assertEqual(out, {'payload': {'name': 'John', 'age': 42}, 'name': 'John', 'age': 42})
+        self.assertEqual(len(calls), 1)
+
+    def test_payload_custom_decoder_errors(self):
+        self.app.config['RESTPLUS_JSON_DECODER'] = json.loads
+        api = restplus.Api(self.app)
+
+        @api.route('/payload/')
+        class Payload(restplus.Resource):
+            def post(self):
+                return {'payload': api.payload}
+
+        with self.app.test_client() as client:
+            response = client.post('/payload/', data='{"bad":', headers={'content-type': 'application/json'})
+            self.assertEqual(response.status_code, 400)
+
+            response = client.post('/payload/', data='{"key": "value"}', headers={'content-type': 'text/plain'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data.decode('utf8')), {'payload': None})
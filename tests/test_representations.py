@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+import flask_restplus as restplus
+
+from flask_restplus import representations
+
+from . import TestCase, patch
+
+
+class JsonBackendTest(TestCase):
+    def setUp(self):
+        super(JsonBackendTest, self).setUp()
+        representations._backends.clear()
+
+    def test_default_backend(self):
+        with self.context():
+            backend = representations.get_backend()
+        self.assertEqual(backend.name, 'json')
+        self.assertIs(backend.module, json)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            representations.get_backend('unknown')
+
+    def test_fallback_on_missing_backend(self):
+        with patch('flask_restplus.representations.load_backend', return_value=None):
+            backend = representations.get_backend('orjson')
+        self.assertEqual(backend.name, 'json')
+        self.assertIs(representations.get_backend('orjson'), backend)
+
+    def test_auto_backend(self):
+        backend = representations.get_backend('auto')
+        self.assertIn(backend.name, representations.BACKENDS)
+
+    def test_dumps_extra_types(self):
+        backend = representations.get_backend('json')
+        data = OrderedDict([
+            ('z', Decimal('1.5')),
+            ('a', datetime(2016, 1, 2, 3, 4, 5)),
+            ('m', date(2016, 1, 2)),
+        ])
+        self.assertEqual(backend.dumps(data),
+                         '{"z": 1.5, "a": "2016-01-02T03:04:05", "m": "2016-01-02"}')
+        with self.assertRaises(TypeError):
+            backend.dumps({'key': object()})
+
+    def test_configured_encoder(self):
+        class Custom(object):
+            pass
+
+        class CustomEncoder(json.JSONEncoder):
+            def default(self, obj):
+                if isinstance(obj, Custom):
+                    return 'custom'
+                return super(CustomEncoder, self).default(obj)
+
+        self.app.config['RESTFUL_JSON'] = {'cls': CustomEncoder}
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                return {'value': Custom()}
+
+        with self.app.test_client() as client:
+            response = client.get('/test/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'value': 'custom'})
+
+        backend = representations.get_backend('json')
+        self.assertEqual(backend.dumps({'value': Custom()}, cls=CustomEncoder), '{"value": "custom"}')
+        self.assertEqual(representations.default_for({'cls': CustomEncoder})(Custom()), 'custom')
+
+    def test_responses_use_backend(self):
+        self.app.config['RESTPLUS_JSON_BACKEND'] = 'auto'
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                return {'price': Decimal('9.99'), 'date': date(2016, 1, 2)}
+
+            def post(self):
+                return {'payload': api.payload}
+
+            def delete(self):
+                api.abort(403)
+
+        backend = representations.get_backend('auto')
+        with patch.object(backend, 'dumps', wraps=backend.dumps) as dumps:
+            with patch.object(backend, 'loads', wraps=backend.loads) as loads:
+                with self.app.test_client() as client:
+                    response = client.get('/test/')
+                    self.assertEqual(json.loads(response.data.decode('utf8')), {'price': 9.99, 'date': '2016-01-02'})
+
+                    response = client.post('/test/', data='{"key": "value"}',
+                                           headers={'content-type': 'application/json'})
+                    self.assertEqual(json.loads(response.data.decode('utf8')), {'payload': {'key': 'value'}})
+
+                    response = client.get('/swagger.json')
+                    self.assertEqual(response.status_code, 200)
+
+                    response = client.delete('/test/')
+                    self.assertEqual(response.status_code, 403)
+        self.assertEqual(dumps.call_count, 4)
+        self.assertEqual(loads.call_count, 1)
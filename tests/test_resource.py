@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+
+from functools import wraps
+
+from flask import request
+
+import flask_restplus as restplus
+
+from . import TestCase, patch
+
+
+class ResourceTest(TestCase):
+    def get(self, url, **kwargs):
+        with self.app.test_client() as client:
+            return client.get(url, **kwargs)
+
+    def test_dispatch_table(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                return {}
+
+            def post(self):
+                return {}
+
+        table = Test.dispatch_table()
+        self.assertEqual(set(table.keys()), set(['GET', 'HEAD', 'POST']))
+        self.assertIs(table['HEAD'], table['GET'])
+        self.assertIs(Test.dispatch_table(), table)
+
+    def test_method_decorators_applied_once(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        def decorator(func):
+            calls.append(func.__name__)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                data = func(*args, **kwargs)
+                data['decorated'] = True
+                return data
+            return wrapper
+
+        @api.route('/test/<int:id>')
+        class Test(restplus.Resource):
+            method_decorators = [decorator]
+            precompose_decorators = True
+
+            def get(self, id):
+                return {'id': id}
+
+        for _ in range(3):
+            response = self.get('/test/42')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data.decode('utf8')), {'id': 42, 'decorated': True})
+        self.assertEqual(calls, ['get'])
+
+    def test_method_decorators_on_bound_methods(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        def decorator(func):
+            calls.append(func)
+
+            def wrapper(**kwargs):
+                data = func(**kwargs)
+                data['decorated'] = True
+                return data
+            return wrapper
+
+        @api.route('/test/<int:id>')
+        class Test(restplus.Resource):
+            method_decorators = [decorator]
+
+            def get(self, id):
+                return {'id': id}
+
+        for _ in range(2):
+            response = self.get('/test/42')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data.decode('utf8')), {'id': 42, 'decorated': True})
+        self.assertEqual(len(calls), 2)
+        self.assertIsInstance(calls[0].__self__, Test)
+
+    def test_method_decorators_by_instance(self):
+        api = restplus.Api(self.app)
+
+        def decorator(func):
+            def wrapper(*args, **kwargs):
+                return {'decorated': True}
+            return wrapper
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def __init__(self, *args, **kwargs):
+                super(Test, self).__init__(*args, **kwargs)
+                self.method_decorators = [decorator]
+
+            def get(self):
+                return {}
+
+        response = self.get('/test/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'decorated': True})
+
+    def test_dispatch_table_by_class(self):
+        api = restplus.Api(self.app)
+
+        class Base(restplus.Resource):
+            def get(self):
+                return {'class': 'base'}
+
+        class Child(Base):
+            def post(self):
+                return {}
+
+        api.add_resource(Base, '/base/')
+        api.add_resource(Child, '/child/')
+
+        self.assertNotIn('POST', Base.dispatch_table())
+        self.assertIn('POST', Child.dispatch_table())
+
+    def test_validation_is_precomputed(self):
+        api = restplus.Api(self.app, validate=True)
+
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+        })
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.expect(person)
+            def post(self):
+                return {}
+
+            def get(self):
+                return {}
+
+        table = Test.dispatch_table()
+        self.assertEqual(table['POST'].model.name, 'Person')
+        self.assertFalse(table['POST'].as_list)
+        self.assertIsNone(table['GET'].model)
+
+        with patch('flask_restplus.resource.payload_validation') as payload_validation:
+            with self.app.test_client() as client:
+                response = client.post('/test/', data='{}', headers={'content-type': 'application/json'})
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(payload_validation.called)
+
+    def test_validate_payload_override(self):
+        api = restplus.Api(self.app, validate=True)
+        calls = []
+
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+        })
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def validate_payload(self, func, handler=None):
+                calls.append(func.__name__)
+                if request.headers.get('X-Skip') is None:
+                    super(Test, self).validate_payload(func, handler)
+
+            @api.expect(person)
+            def post(self):
+                return {}
+
+            def get(self):
+                return {}
+
+        with self.app.test_client() as client:
+            self.assertEqual(client.get('/test/').status_code, 200)
+            response = client.post('/test/', data='{}', headers={'content-type': 'application/json'})
+            self.assertEqual(response.status_code, 400)
+            response = client.post('/test/', data='{}', headers={'content-type': 'application/json', 'X-Skip': '1'})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(calls, ['get', 'post', 'post'])
+
+    def test_negotiation(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                return {'key': 'value'}
+
+        response = self.get('/test/', headers={'Accept': 'application/json'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, 'application/json')
+
+        api.default_mediatype = None
+        for _ in range(2):
+            response = self.get('/test/', headers={'Accept': 'text/html'})
+            self.assertEqual(response.status_code, 406)
+
+    def test_singleton(self):
+        api = restplus.Api(self.app)
+        instances = []
+
+        @api.route('/test/<int:id>')
+        class Test(restplus.Resource):
+            singleton = True
+
+            def get(self, id):
+                instances.append(self)
+                return {'id': id}
+
+        for id in range(3):
+            response = self.get('/test/{0}'.format(id))
+            self.assertEqual(json.loads(response.data.decode('utf8')), {'id': id})
+        self.assertEqual(len(set(instances)), 1)
+        self.assertIs(instances[0].api, api)
+        self.assertIs(self.app.view_functions['test'].view_instance, instances[0])
+
+    def test_singleton_route_kwarg(self):
+        api = restplus.Api(self.app)
+        instances = []
+
+        @api.route('/test/', singleton=True)
+        class Test(restplus.Resource):
+            def get(self):
+                instances.append(self)
+                return {}
+
+        self.get('/test/')
+        self.get('/test/')
+        self.assertTrue(Test.singleton)
+        self.assertIs(instances[0], instances[1])
+
+    def test_default_not_singleton(self):
+        api = restplus.Api(self.app)
+        instances = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                instances.append(self)
+                return {}
+
+        self.get('/test/')
+        self.get('/test/')
+        self.assertIsNot(instances[0], instances[1])
+
+    def test_singleton_with_init(self):
+        api = restplus.Api(self.app)
+
+        class Base(restplus.Resource):
+            def __init__(self, api, *args, **kwargs):
+                super(Base, self).__init__(api, *args, **kwargs)
+                self.state = {}
+
+        class Test(Base):
+            singleton = True
+
+            def get(self):
+                return {}
+
+        with self.assertRaises(restplus.SpecsError):
+            api.add_resource(Test, '/test/')
+
+    def test_head_skip_body(self):
+        api = restplus.Api(self.app)
+        person = api.model('Person', {'name': restplus.fields.String})
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            @api.marshal_with(person)
+            def get(self):
+                return {'name': 'John'}, 200, {'ETag': '"v1"', 'X-Custom': 'value'}
+
+        with patch('flask_restplus.marshalling.marshal') as marshal:
+            with self.app.test_client() as client:
+                response = client.head('/test/')
+            self.assertFalse(marshal.called)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], '"v1"')
+        self.assertEqual(response.headers['X-Custom'], 'value')
+        self.assertEqual(response.content_type, 'application/json')
+        self.assertNotIn('Content-Length', response.headers)
+
+        response = self.get('/test/')
+        self.assertEqual(json.loads(response.data.decode('utf8')), {'name': 'John'})
+
+    def test_head_status_and_errors(self):
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                return {}, 201
+
+        @api.route('/missing/')
+        class Missing(restplus.Resource):
+            def get(self):
+                api.abort(404)
+
+        with self.app.test_client() as client:
+            self.assertEqual(client.head('/test/').status_code, 201)
+            self.assertEqual(client.head('/missing/').status_code, 404)
+
+    def test_head_with_content_length(self):
+        self.app.config['RESTPLUS_HEAD_CONTENT_LENGTH'] = True
+        api = restplus.Api(self.app)
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                return {'name': 'John'}
+
+        with self.app.test_client() as client:
+            get = client.get('/test/')
+            head = client.head('/test/')
+        self.assertEqual(head.headers['Content-Length'], get.headers['Content-Length'])
+        self.assertEqual(head.data, b'')
+
+    def test_custom_head(self):
+        api = restplus.Api(self.app)
+        calls = []
+
+        @api.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                calls.append('get')
+                return {}
+
+            def head(self):
+                calls.append('head')
+                return {}, 200, {'X-Count': '42'}
+
+        with self.app.test_client() as client:
+            response = client.head('/test/')
+        self.assertEqual(calls, ['head'])
+        self.assertEqual(response.headers['X-Count'], '42')
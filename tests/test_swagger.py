@@ -2707,3 +2707,37 @@ class SwaggerTestCase(TestCase):
         post_operation = data['paths']['/test/']['post']
         self.assertIn('deprecated', post_operation)
         self.assertTrue(post_operation['deprecated'])
+
+    def test_sorted_specs_with_etag(self):
+        self.app.config['RESTFUL_JSON'] = {'sort_keys': True}
+        api = self.build_api()
+        model = api.model('Test', {'name': restplus.fields.String})
+
+        @api.route('/test/', endpoint='test')
+        class TestResource(restplus.Resource):
+            @api.etag()
+            @api.response(404, 'Not found')
+            @api.marshal_with(model)
+            def get(self):
+                pass
+
+        data = self.get_specs()
+        responses = data['paths']['/test/']['get']['responses']
+        self.assertEqual(set(responses.keys()), set(['200', '304', '404']))
+
+    def test_sorted_specs_with_idempotency(self):
+        self.app.config['RESTFUL_JSON'] = {'sort_keys': True}
+        api = self.build_api()
+        model = api.model('Test', {'name': restplus.fields.String})
+
+        @api.route('/test/', endpoint='test')
+        class TestResource(restplus.Resource):
+            @api.idempotent
+            @api.response(400, 'Validation error')
+            @api.marshal_with(model, code=201)
+            def post(self):
+                pass
+
+        data = self.get_specs()
+        responses = data['paths']['/test/']['post']['responses']
+        self.assertEqual(set(responses.keys()), set(['201', '400', '409', '422']))
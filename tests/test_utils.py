@@ -3,7 +3,7 @@ from __future__ import unicode_literals
 
 from flask_restplus import utils
 
-from . import TestCase
+from . import TestCase, patch
 
 
 class MergeTestCase(TestCase):
@@ -122,3 +122,66 @@ class UnpackTest(TestCase):
     def test_too_many_values(self):
         with self.assertRaises(ValueError):
             utils.unpack((None, None, None, None))
+
+
+class LRUCacheTest(TestCase):
+    def test_get_set(self):
+        cache = utils.LRUCache(2)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', 'default'), 'default')
+
+    def test_evict_least_recently_used(self):
+        cache = utils.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_pop_and_clear(self):
+        cache = utils.LRUCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertNotIn('a', cache)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_copy_is_empty(self):
+        from copy import deepcopy
+        cache = utils.LRUCache(3)
+        cache.set('a', 1)
+        copied = deepcopy(cache)
+        self.assertEqual(copied.size, 3)
+        self.assertEqual(len(copied), 0)
+
+
+class BestMatchTest(TestCase):
+    def setUp(self):
+        super(BestMatchTest, self).setUp()
+        utils.NEGOTIATIONS.clear()
+
+    def test_best_match(self):
+        mediatypes = ['application/json', 'application/xml']
+        self.assertEqual(utils.best_match('application/xml', mediatypes), 'application/xml')
+        self.assertEqual(utils.best_match('application/*;q=0.5, application/xml', mediatypes), 'application/xml')
+        self.assertEqual(utils.best_match('*/*', mediatypes), 'application/json')
+        self.assertIsNone(utils.best_match('text/html', mediatypes))
+        self.assertEqual(utils.best_match('text/html', mediatypes, 'text/plain'), 'text/plain')
+        self.assertEqual(utils.best_match(None, mediatypes, 'application/json'), 'application/json')
+
+    def test_cached(self):
+        mediatypes = ['application/json']
+        self.assertEqual(utils.best_match('application/json', mediatypes), 'application/json')
+        self.assertIsNone(utils.best_match('text/html', mediatypes))
+        self.assertEqual(len(utils.NEGOTIATIONS), 2)
+        with patch('flask_restplus.utils.parse_accept_header') as parse_accept_header:
+            self.assertEqual(utils.best_match('application/json', mediatypes), 'application/json')
+            self.assertIsNone(utils.best_match('text/html', mediatypes))
+            self.assertFalse(parse_accept_header.called)
+        self.assertEqual(utils.best_match('application/json', ['application/xml'], 'text/plain'), 'text/plain')
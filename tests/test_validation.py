@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from flask import Blueprint
+from jsonschema import Draft4Validator, RefResolver
+
+from flask_restplus import fields, Api
+from flask_restplus.validation import CompiledValidator
+
+from . import TestCase
+
+
+class CompiledValidatorTest(TestCase):
+    def setUp(self):
+        super(CompiledValidatorTest, self).setUp()
+        blueprint = Blueprint('api', __name__)
+        self.api = Api(blueprint)
+        self.app.register_blueprint(blueprint)
+
+    def assert_same_errors(self, model, data):
+        resolver = RefResolver.from_schema({
+            'definitions': dict((name, m.__schema__) for name, m in self.api.models.items())
+        })
+        expected = [model.format_error(e)
+                    for e in Draft4Validator(model.__schema__, resolver=resolver).iter_errors(data)]
+        compiled = [model.format_error(e)
+                    for e in CompiledValidator(model.__schema__, resolver=resolver).iter_errors(data)]
+        self.assertEqual(compiled, expected)
+        return compiled
+
+    def test_simple_fields(self):
+        model = self.api.model('Person', {
+            'name': fields.String(required=True, min_length=2, max_length=5, pattern='^[A-Z]'),
+            'age': fields.Integer(min=0, max=150),
+            'score': fields.Float(min=0, max=10, exclusiveMax=True, multiple=0.5),
+            'active': fields.Boolean,
+            'role': fields.String(enum=['admin', 'user']),
+        })
+
+        self.assertEqual(self.assert_same_errors(model, {'name': 'John', 'age': 42}), [])
+        errors = self.assert_same_errors(model, {
+            'age': -1,
+            'score': 10,
+            'active': 'yes',
+            'role': 'guest',
+        })
+        self.assertEqual(len(errors), 5)
+        self.assert_same_errors(model, {'name': 'j', 'age': True, 'score': 1.2})
+        self.assert_same_errors(model, {'name': 'Johnny', 'age': 151, 'score': 'high'})
+        self.assert_same_errors(model, 'not an object')
+
+    def test_nested_and_lists(self):
+        address = self.api.model('Address', {
+            'road': fields.String(required=True),
+        })
+        model = self.api.model('Person', {
+            'address': fields.Nested(address),
+            'tags': fields.List(fields.String, min_items=1, max_items=2, unique=True),
+            'addresses': fields.List(fields.Nested(address)),
+        })
+
+        self.assertEqual(self.assert_same_errors(model, {'address': {'road': 'main'}, 'tags': ['a']}), [])
+        errors = self.assert_same_errors(model, {
+            'address': {},
+            'tags': ['a', 'a', 1],
+            'addresses': [{'road': 'main'}, {'road': 42}],
+        })
+        self.assertIn('address.road', dict(errors))
+        self.assertIn('addresses.1.road', dict(errors))
+        self.assert_same_errors(model, {'tags': []})
+
+    def test_inheritance(self):
+        parent = self.api.model('Parent', {
+            'name': fields.String(required=True),
+        })
+        child = self.api.inherit('Child', parent, {
+            'age': fields.Integer(required=True),
+        })
+
+        self.assertEqual(self.assert_same_errors(child, {'name': 'John', 'age': 3}), [])
+        errors = self.assert_same_errors(child, {'age': 'three'})
+        self.assertEqual(set(dict(errors).keys()), set(['name', 'age']))
+
+    def test_recursive_reference(self):
+        node = self.api.model('Node', {
+            'name': fields.String(required=True),
+        })
+        node['children'] = fields.List(fields.Nested(node))
+
+        self.assert_same_errors(node, {'name': 'root', 'children': [{'name': 'child', 'children': [{}]}]})
+
+    def test_fallback_on_unsupported_keywords(self):
+        class Strict(fields.Raw):
+            def schema(self):
+                schema = super(Strict, self).schema()
+                schema['additionalProperties'] = False
+                return schema
+
+        model = self.api.model('Model', {
+            'strict': Strict,
+        })
+
+        errors = self.assert_same_errors(model, {'strict': {'extra': 1}})
+        self.assertEqual(list(dict(errors).keys()), ['strict'])
+
+    def test_is_valid(self):
+        model = self.api.model('Person', {
+            'name': fields.String(required=True),
+        })
+        validator = CompiledValidator(model.__schema__)
+        self.assertTrue(validator.is_valid({'name': 'John'}))
+        self.assertFalse(validator.is_valid({}))
+
+    def test_model_validator_is_compiled(self):
+        model = self.api.model('Person', {
+            'name': fields.String(required=True),
+        })
+        self.assertIsInstance(model.validator(), CompiledValidator)
+
+        model.compiled_validation = False
+        model.validators.clear()
+        self.assertIsInstance(model.validator(), Draft4Validator)